@@ -3,7 +3,7 @@ title = Math-Forest
 package.name = mathforest
 package.domain = org.mathforest
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas,ogg,mp3,ttf,json,sqlite3
+source.include_exts = py,png,jpg,kv,atlas,ogg,mp3,ttf,json,sqlite3,pack,bin
 version = 1.0.0
 requirements = python3,kivy==2.3.0,kivymd,pillow,sqlite3
 orientation = portrait
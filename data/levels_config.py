@@ -16,6 +16,21 @@ THEMES = [
     {'id': 'haunted',    'name_key': 'haunted',   'bg_color': [0.15, 0.08, 0.20, 1], 'levels': range(271, 301)},
 ]
 
+# Maze carving per theme: algorithm name (logic.maze_gen.MazeGenerator
+# .ALGORITHMS) and the share of dead ends removed by the braid pass.
+MAZE_STYLES = {
+    'forest':     {'algorithm': 'backtracker', 'braid': 0.0},
+    'cave':       {'algorithm': 'kruskal',     'braid': 0.0},
+    'clearing':   {'algorithm': 'backtracker', 'braid': 0.4},
+    'night':      {'algorithm': 'wilson',      'braid': 0.0},
+    'underwater': {'algorithm': 'eller',       'braid': 0.1},
+    'volcano':    {'algorithm': 'kruskal',     'braid': 0.2},
+    'snow':       {'algorithm': 'wilson',      'braid': 0.1},
+    'cloud':      {'algorithm': 'eller',       'braid': 0.5},
+    'desert':     {'algorithm': 'backtracker', 'braid': 0.2},
+    'haunted':    {'algorithm': 'wilson',      'braid': 0.3},
+}
+
 ANIMALS_PER_SET = [
     ['rabbit','fox','deer','bear','owl','wolf','squirrel','hedgehog','raccoon','beaver','otter','skunk','moose','lynx','eagle'],
     ['bat','mole','spider','scorpion','snake','lizard','toad','worm','cricket','beetle','mushroom_gnome','cave_bear','stalactite_sprite','glowworm','salamander'],
@@ -37,6 +52,10 @@ def get_theme_for_level(level: int) -> dict:
     return THEMES[-1]
 
 
+def get_maze_style(level: int) -> dict:
+    return MAZE_STYLES.get(get_theme_for_level(level)['id'], MAZE_STYLES['forest'])
+
+
 def get_animals_for_level(level: int) -> list:
     theme_idx = (level - 1) // 30
     return ANIMALS_PER_SET[min(theme_idx, len(ANIMALS_PER_SET) - 1)]
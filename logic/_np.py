@@ -0,0 +1,8 @@
+"""
+Optional NumPy: ``np`` is the module, or None where it isn't installed
+(Android builds ship without it). Callers keep a pure-Python path.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
@@ -0,0 +1,53 @@
+"""
+Set of small non-negative ints (level numbers) stored as one Python int.
+
+Membership and insertion are O(1) bit operations; 300 levels fit in 38
+bytes, serialized as a base64 string (``to_base64``).
+"""
+import base64
+
+
+class LevelSet:
+    __slots__ = ('bits',)
+
+    def __init__(self, levels=()):
+        bits = 0
+        for level in levels:
+            bits |= 1 << int(level)
+        self.bits = bits
+
+    @classmethod
+    def from_base64(cls, text: str) -> 'LevelSet':
+        s = cls()
+        s.bits = int.from_bytes(base64.b64decode(text), 'little')
+        return s
+
+    def to_base64(self) -> str:
+        raw = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, 'little')
+        return base64.b64encode(raw).decode('ascii')
+
+    def __contains__(self, level) -> bool:
+        return level >= 0 and self.bits >> level & 1 == 1
+
+    def add(self, level: int):
+        self.bits |= 1 << level
+
+    def discard(self, level: int):
+        self.bits &= ~(1 << level)
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __iter__(self):
+        bits, level = self.bits, 0
+        while bits:
+            if bits & 1:
+                yield level
+            bits >>= 1
+            level += 1
+
+    def __eq__(self, other):
+        return isinstance(other, LevelSet) and other.bits == self.bits
+
+    def __repr__(self):
+        return f'LevelSet({list(self)!r})'
@@ -0,0 +1,193 @@
+"""
+Declarative question templates (``data/curriculum.json``).
+
+Each template names a skill and gives its random variables (``range`` with
+int or expression bounds, ``choice``), optional ``constraints``, the three
+packed operands ``a``/``b``/``c`` as expressions, the ``answer`` and
+distractor ``max_val`` as expressions of the operands, and a text template
+whose fields are expressions of ``a``/``b``/``c``.
+
+At load time every template is turned into Python source for three plain
+functions and compiled once:
+
+    gen(level, scale) -> spec     draw a question (ranges marked ``scaled``
+                                  follow the skill's range factor)
+    spec(a, b, c)     -> spec     (kind, a, b, c, answer, max_val)
+    fmt(a, b, c)      -> str      text, from the pre-split template
+
+The compiled code object is cached with ``marshal`` in
+``data/__pycache__``, keyed by a hash of the JSON file and the Python
+version, so later starts skip parsing. Kinds are drawn through a
+cumulative-weight table with ``bisect``.
+"""
+import ast
+import bisect
+import hashlib
+import importlib.util
+import json
+import marshal
+import math
+import os
+import random
+import string
+
+CURRICULUM_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                               'data', 'curriculum.json')
+CACHE_VERSION = 1
+# Redraws allowed when a template's constraints fail
+MAX_TRIES = 8
+
+_FUNCS = {'max': max, 'min': min, 'abs': abs, 'gcd': math.gcd}
+_RESERVED = {'a', 'b', 'c', 'answer', 'level', 'scale'}
+_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare,
+          ast.Constant, ast.Name, ast.Load, ast.Call, ast.operator,
+          ast.unaryop, ast.boolop, ast.cmpop)
+
+
+def _expr(src, names) -> str:
+    """Validated expression source: arithmetic over ``names`` only."""
+    src = str(src)
+    tree = ast.parse(src, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _NODES):
+            raise ValueError(f'curriculum: unsupported syntax in {src!r}')
+        if isinstance(node, ast.Constant) and not isinstance(node.value, int):
+            raise ValueError(f'curriculum: only int constants in {src!r}')
+        if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in _FUNCS or node.keywords):
+            raise ValueError(f'curriculum: unknown call in {src!r}')
+        if (isinstance(node, ast.Name) and node.id not in names
+                and node.id not in _FUNCS):
+            raise ValueError(f'curriculum: unknown name {node.id!r} in {src!r}')
+    return f'({src})'
+
+
+def _hi(hi, lo, scale, min_hi):
+    """Upper bound scaled by a skill's range factor (as the generator does)."""
+    if scale == 1.0:
+        return hi
+    return max(min_hi, lo, round(hi * scale))
+
+
+def _template_source(i, kind, t) -> str:
+    names = {'level', 'scale'}
+    draws = []
+    for name, var in t.get('vars', {}).items():
+        if name in _RESERVED or not name.isidentifier():
+            raise ValueError(f'curriculum: bad variable name {name!r}')
+        if 'choice' in var:
+            values = tuple(int(v) for v in var['choice'])
+            draws.append(f'{name} = choice({values!r})')
+        else:
+            lo, hi = (_expr(v, names) for v in var['range'])
+            if var.get('scaled'):
+                hi = f'_hi({hi}, {lo}, scale, {int(var.get("min_hi", 3))})'
+            draws.append(f'{name} = randint({lo}, {hi})')
+        names.add(name)
+    checks = [_expr(c, names) for c in t.get('constraints', ())]
+    ops = t['operands']
+    operands = [_expr(ops.get(k, '0'), names) for k in 'abc']
+
+    lines = [f'def gen_{i}(level, scale):']
+    if checks:
+        lines.append('    for _ in range(MAX_TRIES):')
+        lines += ['        ' + d for d in draws]
+        lines.append(f'        if {" and ".join(checks)}:')
+        lines.append('            break')
+    else:
+        lines += ['    ' + d for d in draws]
+    lines.append(f'    return spec_{i}({", ".join(operands)})')
+
+    answer = _expr(t['answer'], {'a', 'b', 'c'})
+    max_val = _expr(t['max_val'], {'a', 'b', 'c', 'answer'})
+    lines += [f'def spec_{i}(a, b=0, c=0):',
+              f'    answer = {answer}',
+              f'    return {kind}, a, b, c, answer, {max_val}']
+
+    # Pre-split text: literals and field expressions joined in one call
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(t['text']):
+        if literal:
+            parts.append(repr(literal))
+        if field is not None:
+            parts.append(f'str({_expr(field, {"a", "b", "c"})})')
+    lines += [f'def fmt_{i}(a, b=0, c=0):',
+              f'    return "".join(({", ".join(parts)},))']
+    return '\n'.join(lines) + '\n'
+
+
+def _compile(doc, kind_names):
+    """(meta, code): meta lists (group, kind, weight, index) per template."""
+    meta, src = [], []
+    for group, templates in doc['groups'].items():
+        for t in templates:
+            kind = kind_names.index(t['skill'])
+            i = len(meta)
+            meta.append((group, kind, float(t.get('weight', 1)), i))
+            src.append(_template_source(i, kind, t))
+    return meta, compile('\n'.join(src), CURRICULUM_FILE, 'exec')
+
+
+class Curriculum:
+
+    def __init__(self, meta, code):
+        ns = dict(_FUNCS, randint=random.randint, choice=random.choice,
+                  _hi=_hi, MAX_TRIES=MAX_TRIES)
+        exec(code, ns)
+        self._gen, self._spec, self._fmt, self.weights = {}, {}, {}, {}
+        self._groups = {}           # group -> (kinds, cumulative weights)
+        for group, kind, weight, i in meta:
+            self._gen[kind] = ns[f'gen_{i}']
+            self._spec[kind] = ns[f'spec_{i}']
+            self._fmt[kind] = ns[f'fmt_{i}']
+            self.weights[kind] = weight
+            kinds, cum = self._groups.setdefault(group, ([], []))
+            kinds.append(kind)
+            cum.append((cum[-1] if cum else 0.0) + weight)
+        self._groups = {g: (tuple(k), c) for g, (k, c) in self._groups.items()}
+
+    @classmethod
+    def load(cls, path: str = CURRICULUM_FILE, kind_names=()) -> 'Curriculum':
+        with open(path, 'rb') as f:
+            raw = f.read()
+        key = hashlib.sha1(raw + importlib.util.MAGIC_NUMBER
+                           + repr((CACHE_VERSION, tuple(kind_names))).encode())
+        cache = os.path.join(os.path.dirname(path), '__pycache__',
+                             f'curriculum.{key.hexdigest()[:16]}.bin')
+        try:
+            with open(cache, 'rb') as f:
+                meta, code = marshal.load(f)
+            return cls(meta, code)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        meta, code = _compile(json.loads(raw.decode('utf-8')), list(kind_names))
+        try:
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            tmp = cache + '.tmp'
+            with open(tmp, 'wb') as f:
+                marshal.dump((meta, code), f)
+            os.replace(tmp, cache)
+        except OSError:
+            pass    # read-only install: compile again next start
+        return cls(meta, code)
+
+    def __contains__(self, kind):
+        return kind in self._gen
+
+    def kinds(self, group: str) -> tuple:
+        return self._groups.get(group, ((), []))[0]
+
+    def choose(self, group: str, rng=random) -> int:
+        """Weighted kind draw for ``group`` (bisect on cumulative weights)."""
+        kinds, cum = self._groups[group]
+        return kinds[bisect.bisect_right(cum, rng.random() * cum[-1])]
+
+    def generate(self, kind: int, level: int, scale: float = 1.0):
+        return self._gen[kind](level, scale)
+
+    def spec(self, kind: int, a: int, b: int, c: int = 0):
+        return self._spec[kind](a, b, c)
+
+    def format(self, kind: int, a: int, b: int, c: int = 0) -> str:
+        return self._fmt[kind](a, b, c)
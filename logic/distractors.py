@@ -0,0 +1,85 @@
+"""
+Wrong-answer (distractor) engine.
+
+Always returns exactly ``k`` unique wrong answers >= ``floor`` in O(k):
+offsets are sampled without replacement from a window around the answer
+(``-spread..-1`` and ``1..spread``). When the answer is too close to
+``floor`` for the lower half, the upper half is widened so the window
+still holds at least ``k`` offsets. Optional type-aware candidates (carry
+slips, swapped digits, wrong operation) supplied by the caller are mixed
+in first.
+"""
+import random
+
+from logic._np import np
+
+# Chance that each plausible, type-aware mistake is offered (at most k // 2)
+TYPED_CHANCE = 0.5
+
+
+def spread_for(max_val: int) -> int:
+    return max(3, max_val // 5)
+
+
+def _window(answer, spread, k, floor):
+    """(below, above): offsets available under and over the answer."""
+    below = max(min(spread, answer - floor), 0)
+    return below, max(spread, k - below)
+
+
+def make_distractors(answer, k=3, spread=3, floor=0, mistakes=(),
+                     rng=random) -> list:
+    """Exactly ``k`` distinct wrong answers >= ``floor``.
+
+    ``mistakes``: plausible slips for the question (most plausible first,
+    see ``question_gen.typed_mistakes``); each is offered with
+    ``TYPED_CHANCE``, up to ``k // 2`` of them.
+    """
+    answer = int(answer)
+    chosen = []
+    if mistakes:
+        seen = {answer}
+        for cand in mistakes:
+            if len(chosen) >= k // 2:
+                break
+            if (cand >= floor and cand not in seen
+                    and abs(cand - answer) <= max(answer, 10)
+                    and rng.random() < TYPED_CHANCE):
+                seen.add(cand)
+                chosen.append(cand)
+    below, above = _window(answer, spread, k, floor)
+    for j in rng.sample(range(below + above), k):
+        if len(chosen) >= k:
+            break
+        cand = answer - (j + 1) if j < below else answer + (j - below + 1)
+        if cand not in chosen:
+            chosen.append(cand)
+    # Each typed pick can collide with at most one window draw; top up past
+    # the window edge, which is outside every earlier candidate.
+    extra = above
+    while len(chosen) < k:
+        extra += 1
+        if answer + extra not in chosen:
+            chosen.append(answer + extra)
+    return chosen
+
+
+def make_distractors_np(answer, max_val, floor, rng):
+    """Vectorized window sampling (no typed slips) for a column of
+    answers: (n, 3) array. Requires NumPy."""
+    spread = np.maximum(3, max_val // 5)
+    below = np.clip(np.minimum(spread, answer - floor), 0, None)
+    above = np.maximum(spread, 3 - below)
+    size = below + above
+    # Three distinct indices in [0, size) without replacement
+    j1 = rng.integers(0, size)
+    j2 = rng.integers(0, size - 1)
+    j2 = j2 + (j2 >= j1)
+    lo, hi = np.minimum(j1, j2), np.maximum(j1, j2)
+    j3 = rng.integers(0, size - 2)
+    j3 = j3 + (j3 >= lo)
+    j3 = j3 + (j3 >= hi)
+    j = np.stack([j1, j2, j3], axis=1)
+    below = below[:, None]
+    offset = np.where(j < below, -(j + 1), j - below + 1)
+    return answer[:, None] + offset
@@ -0,0 +1,136 @@
+"""
+Endless forest: an unbounded-height maze streamed in fixed-size chunks.
+
+Chunk ``i`` holds ``chunk_rows`` rows of rooms and is carved with Eller's
+algorithm (``EllerRows``) from a seed derived from ``(seed, i)``; its last
+row is Eller's finishing row, so each chunk is a perfect maze on its own.
+The wall row on top of a chunk (the seam) gets exactly one opening, which
+keeps the whole strip a single perfect maze. Because every chunk can be
+rebuilt from its index alone, only the chunks around the player are kept;
+memory stays constant however far the player walks. Defeated animals are
+remembered per chunk index (for the last ``DEFEATED_CHUNKS`` chunks) and
+survive eviction, so a rebuilt chunk doesn't bring them back.
+
+Coordinates are grid cells like ``MazeGenerator``: x in [0, width), y >= 0
+grows upwards (row 0 is the bottom border wall).
+"""
+import random
+from collections import OrderedDict
+
+from logic.maze_gen import EllerRows, MazeGenerator, level_seed
+
+# Chunks whose defeated animals are remembered (oldest forgotten first)
+DEFEATED_CHUNKS = 4096
+
+
+class EndlessMaze:
+    WALL = MazeGenerator.WALL
+    PATH = MazeGenerator.PATH
+
+    def __init__(self, width_rooms: int = 5, chunk_rows: int = 8,
+                 seed: int = 0, view_rows: int = 0,
+                 animals_per_chunk: int = 2):
+        """``view_rows`` = grid rows visible on screen; enough chunks are
+        kept on each side of the player's chunk to cover them."""
+        self.rooms = max(int(width_rooms), 2)
+        self.width = 2 * self.rooms + 1
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self.chunk_height = 2 * self.chunk_rows
+        self.seed = seed
+        self.keep = self.keep_for(view_rows)
+        self.animals_per_chunk = animals_per_chunk
+        self.start_pos = (1, 1)
+        self._chunks = OrderedDict()   # index -> (cells, animal positions)
+        self._defeated = OrderedDict()  # index -> defeated positions
+
+    def keep_for(self, view_rows: int) -> int:
+        """Chunks to keep on each side so ``view_rows`` rows above or below
+        the player are always loaded."""
+        return max(1, -(-int(view_rows) // self.chunk_height))
+
+    # ── Coordinates ──────────────────────────────────────────────────────
+    def chunk_of(self, y: int) -> int:
+        return max(y - 1, 0) // self.chunk_height
+
+    def chunk_span(self, idx: int):
+        """Grid rows [lo, hi) covered by chunk ``idx``."""
+        lo = 1 + idx * self.chunk_height
+        return lo, lo + self.chunk_height
+
+    # ── Access ───────────────────────────────────────────────────────────
+    def cell(self, x: int, y: int) -> int:
+        if y <= 0 or not 0 <= x < self.width:
+            return self.WALL
+        idx = self.chunk_of(y)
+        cells, _ = self.chunk(idx)
+        return cells[(y - self.chunk_span(idx)[0]) * self.width + x]
+
+    def chunk(self, idx: int):
+        """(cells, animals) for chunk ``idx``, generating it if needed.
+
+        ``cells`` is a flat row-major bytearray of ``chunk_height`` rows;
+        ``animals`` are global (x, y) room positions.
+        """
+        hit = self._chunks.get(idx)
+        if hit is None:
+            hit = self._chunks[idx] = self._generate(idx)
+        else:
+            self._chunks.move_to_end(idx)
+        return hit
+
+    def loaded(self):
+        return list(self._chunks)
+
+    def stream(self, y: int):
+        """Keep only the chunks within ``keep`` of row ``y``.
+
+        Returns ``(added, evicted)`` chunk indices so a view can add or drop
+        the matching canvas groups. Defeated animals are not forgotten.
+        """
+        centre = self.chunk_of(y)
+        wanted = range(max(centre - self.keep, 0), centre + self.keep + 1)
+        evicted = [i for i in self._chunks if i not in wanted]
+        for i in evicted:
+            del self._chunks[i]
+        added = [i for i in wanted if i not in self._chunks]
+        for i in added:
+            self.chunk(i)
+        return added, evicted
+
+    # ── Defeated animals ─────────────────────────────────────────────────
+    def defeat(self, pos):
+        idx = self.chunk_of(pos[1])
+        self._defeated.setdefault(idx, set()).add(pos)
+        self._defeated.move_to_end(idx)
+        if len(self._defeated) > DEFEATED_CHUNKS:
+            self._defeated.popitem(last=False)
+
+    def is_defeated(self, pos) -> bool:
+        return pos in self._defeated.get(self.chunk_of(pos[1]), ())
+
+    # ── Generation ───────────────────────────────────────────────────────
+    def _generate(self, idx):
+        rng = random.Random(level_seed(idx, f'endless:{self.seed}'))
+        w, rw = self.width, self.rooms
+        cells = bytearray([self.WALL]) * (w * self.chunk_height)
+        rows = EllerRows(rw, rng)
+        for k in range(self.chunk_rows):
+            right, up = rows.next_row(last=(k == self.chunk_rows - 1))
+            g = 2 * k * w + 1
+            for rx in range(rw):
+                cells[g + 2 * rx] = self.PATH
+                if rx < rw - 1 and right[rx]:
+                    cells[g + 2 * rx + 1] = self.PATH
+                if up[rx]:
+                    cells[g + 2 * rx + w] = self.PATH
+        # Seam: a single passage into the next chunk
+        seam = (self.chunk_height - 1) * w + 2 * rng.randrange(rw) + 1
+        cells[seam] = self.PATH
+
+        lo = self.chunk_span(idx)[0]
+        rooms = [(2 * rx + 1, lo + 2 * ry)
+                 for ry in range(self.chunk_rows) for rx in range(rw)]
+        if idx == 0:
+            rooms.remove(self.start_pos)
+        animals = rng.sample(rooms, min(self.animals_per_chunk, len(rooms)))
+        return cells, animals
@@ -0,0 +1,184 @@
+"""
+Append-only gameplay event log.
+
+Each event is one fixed-layout binary record (``RECORD``: time, type,
+skill, flag, level, value), packed on the calling thread and written by a
+background thread in batches to ``events.bin`` in the profile directory.
+
+Stats never replay the whole history: every ``FOLD_EVERY`` records the
+writer folds the new part of the log into ``events.json`` (aggregates plus
+the byte offset they cover), so ``stats()`` reads that snapshot and at
+most ``FOLD_EVERY`` newer records. Past ``MAX_BYTES`` the log is folded
+and rotated to ``events.1.bin`` (one old file is kept).
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+LOG_FILE = 'events.bin'
+SNAPSHOT_FILE = 'events.json'
+MAX_BYTES = 256 * 1024
+FOLD_EVERY = 2048
+# Gaps between events longer than this don't count as play time
+IDLE_GAP = 60.0
+
+# time (s), type, skill (NO_SKILL: none), flag, level, value
+RECORD = struct.Struct('<dBBBxHi')
+NO_SKILL = 255
+
+(MOVE, QUESTION, ANSWER, DEFEAT, LEVEL_COMPLETE, PURCHASE,
+ GAME_OVER) = range(7)
+COUNTED = {MOVE: 'moves', DEFEAT: 'defeated', LEVEL_COMPLETE: 'levels',
+           PURCHASE: 'purchases', GAME_OVER: 'game_overs'}
+
+
+def _empty():
+    totals = {name: 0 for name in COUNTED.values()}
+    totals.update(play_time=0.0, last_time=0.0)
+    return {'offset': 0, 'totals': totals, 'skills': {}}
+
+
+def fold(snapshot: dict, data: bytes):
+    """Add the records in ``data`` to ``snapshot``'s aggregates."""
+    totals, skills = snapshot['totals'], snapshot['skills']
+    last = totals['last_time']
+    for t, etype, skill, flag, level, value in RECORD.iter_unpack(data):
+        if last and 0.0 < t - last <= IDLE_GAP:
+            totals['play_time'] += t - last
+        last = t
+        if etype == ANSWER:
+            # [answers, correct, latency ms sum]
+            row = skills.setdefault(str(skill), [0, 0, 0])
+            row[0] += 1
+            row[1] += flag
+            row[2] += value
+        elif etype in COUNTED:
+            totals[COUNTED[etype]] += 1
+    totals['last_time'] = last
+
+
+class EventLog:
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, LOG_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()       # file and snapshot
+        self._snapshot = self._read_snapshot()
+        self._trim_torn()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, etype: int, level: int = 0, skill: int = NO_SKILL,
+               flag: int = 0, value: int = 0):
+        self._queue.put(RECORD.pack(time.time(), etype, skill, flag,
+                                    level & 0xFFFF, value))
+
+    def close(self):
+        """Write what is queued and stop the writer."""
+        self._queue.put(None)
+        self._thread.join()
+
+    # ── Reading ──────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Accuracy and mean latency per skill, play time and counters."""
+        from logic.question_gen import SKILLS
+
+        with self._lock:
+            snapshot = json.loads(json.dumps(self._snapshot))
+            fold(snapshot, self._read_tail(snapshot['offset']))
+        totals = snapshot['totals']
+        skills = {}
+        for kind, (answers, correct, latency) in snapshot['skills'].items():
+            kind = int(kind)
+            name = SKILLS[kind] if kind < len(SKILLS) else str(kind)
+            skills[name] = {'answers': answers,
+                            'accuracy': correct / answers,
+                            'latency_ms': latency / answers}
+        answers = sum(s['answers'] for s in skills.values())
+        correct = sum(row[1] for row in snapshot['skills'].values())
+        return dict(totals, answers=answers, skills=skills,
+                    accuracy=correct / answers if answers else 0.0)
+
+    # ── Writer thread ────────────────────────────────────────────────────
+    def _run(self):
+        pending = 0
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            data = b''.join(r for r in batch if r is not None)
+            with self._lock:
+                size = self._append(data)
+                pending += len(data) // RECORD.size
+                if size >= MAX_BYTES:
+                    self._fold(rotate=True)
+                    pending = 0
+                elif pending >= FOLD_EVERY or (stop and pending):
+                    self._fold()
+                    pending = 0
+            if stop:
+                return
+
+    def _append(self, data) -> int:
+        try:
+            with open(self.path, 'ab') as f:
+                if data:
+                    f.write(data)
+                return f.tell()
+        except OSError:
+            return 0
+
+    def _fold(self, rotate=False):
+        snapshot = self._snapshot
+        tail = self._read_tail(snapshot['offset'])
+        fold(snapshot, tail)
+        snapshot['offset'] += len(tail)
+        if rotate:
+            try:
+                os.replace(self.path, self.path[:-len('.bin')] + '.1.bin')
+                snapshot['offset'] = 0
+            except OSError:
+                pass
+        tmp = self.snapshot_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.snapshot_path)
+        except OSError:
+            pass
+
+    # ── Files ────────────────────────────────────────────────────────────
+    def _read_snapshot(self) -> dict:
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return _empty()
+
+    def _trim_torn(self):
+        """Cut a record torn by a crash so later appends stay aligned."""
+        try:
+            with open(self.path, 'r+b') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % RECORD.size:
+                    f.truncate(size - size % RECORD.size)
+        except OSError:
+            pass
+
+    def _read_tail(self, offset) -> bytes:
+        """Whole records after ``offset`` (a torn last record is skipped)."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return b''
+        return data[:len(data) - len(data) % RECORD.size]
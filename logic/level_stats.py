@@ -0,0 +1,128 @@
+"""
+Per-level progress: best stars, best time, attempts and last played.
+
+The table is four arrays indexed by level number, stored in the save as
+``level_stats``. Each play is first appended to a short history log
+(``level_history``, ``[level, stars, tenths, timestamp]``), which keeps a
+play down to one small journaled change; once the log holds
+``HISTORY_LIMIT`` events it is folded into the table and cleared.
+
+Total stars (the sum of best stars) and the number of completed levels
+are kept up to date on every play instead of being recomputed.
+"""
+import time
+from array import array
+
+from data.levels_config import THEMES
+
+LEVEL_COUNT = THEMES[-1]['levels'][-1]
+# Plays kept in the log before it is folded into the table
+HISTORY_LIMIT = 32
+# Table columns: array typecode per column
+COLUMNS = {'stars': 'B', 'time': 'I', 'attempts': 'I', 'played': 'I'}
+
+
+class LevelStats:
+    """Times are stored in tenths of a second; 0 means "no time yet"."""
+
+    def __init__(self, table=None, history=None):
+        table = table or {}
+        self.table = {name: array(code, table.get(name) or ())
+                      for name, code in COLUMNS.items()}
+        self.history = [list(e) for e in (history or ())]
+        self._grow(max([LEVEL_COUNT] + [e[0] for e in self.history]))
+        # Best (stars, tenths) of the logged plays, per level
+        self._pending = {}
+        for level, stars, tenths, _ in self.history:
+            self._pend(level, stars, tenths)
+        self.total_stars = 0
+        self.completed = 0
+        for level in range(len(self.table['stars'])):
+            stars = self.best_stars(level)
+            self.total_stars += stars
+            self.completed += stars > 0
+
+    @classmethod
+    def from_save(cls, save) -> 'LevelStats':
+        """Stats whose table and log are the save's own."""
+        stats = cls(save.get('level_stats'), save.get('level_history'))
+        save.data['level_stats'] = stats.table
+        save.data['level_history'] = stats.history
+        save.data['total_stars'] = stats.total_stars
+        return stats
+
+    # ── Queries ──────────────────────────────────────────────────────────
+    def best_stars(self, level: int) -> int:
+        stars = self.table['stars']
+        best = stars[level] if level < len(stars) else 0
+        pending = self._pending.get(level)
+        return max(best, pending[0]) if pending else best
+
+    def best_time(self, level: int):
+        """Fastest completion in seconds, or None."""
+        times = self.table['time']
+        best = times[level] if level < len(times) else 0
+        pending = self._pending.get(level)
+        if pending and pending[1] and (not best or pending[1] < best):
+            best = pending[1]
+        return best / 10.0 if best else None
+
+    def attempts(self, level: int) -> int:
+        attempts = self.table['attempts']
+        n = attempts[level] if level < len(attempts) else 0
+        return n + sum(1 for e in self.history if e[0] == level)
+
+    def last_played(self, level: int) -> int:
+        for e in reversed(self.history):
+            if e[0] == level:
+                return e[3]
+        played = self.table['played']
+        return played[level] if level < len(played) else 0
+
+    @property
+    def completion(self) -> float:
+        """Share of all levels completed, 0..1."""
+        return self.completed / LEVEL_COUNT
+
+    # ── Updates ──────────────────────────────────────────────────────────
+    def record(self, level: int, stars: int, seconds: float = None,
+               now: int = None) -> bool:
+        """Log one play (``stars`` 0 for a failed one). Returns True when
+        the log was folded into the table."""
+        now = int(time.time()) if now is None else now
+        tenths = int(round(seconds * 10)) if stars and seconds else 0
+        best = self.best_stars(level)
+        if stars > best:
+            self.completed += best == 0
+            self.total_stars += stars - best
+        self._grow(level)
+        self.history.append([level, stars, tenths, now])
+        self._pend(level, stars, tenths)
+        if len(self.history) >= HISTORY_LIMIT:
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """Fold the history log into the table and clear it."""
+        t = self.table
+        for level, stars, tenths, played in self.history:
+            if stars > t['stars'][level]:
+                t['stars'][level] = min(stars, 255)
+            if tenths and (not t['time'][level] or tenths < t['time'][level]):
+                t['time'][level] = tenths
+            t['attempts'][level] += 1
+            t['played'][level] = max(t['played'][level], played)
+        self.history.clear()
+        self._pending.clear()
+
+    def _pend(self, level, stars, tenths):
+        best_stars, best_tenths = self._pending.get(level, (0, 0))
+        if tenths and (not best_tenths or tenths < best_tenths):
+            best_tenths = tenths
+        self._pending[level] = (max(best_stars, stars), best_tenths)
+
+    def _grow(self, level):
+        for column in self.table.values():
+            if len(column) <= level:
+                column.extend([0] * (level + 1 - len(column)))
@@ -1,8 +1,118 @@
 """
-Procedural maze generator using Recursive Backtracker (DFS).
-Difficulty scales with level number.
+Procedural maze generator with pluggable carving algorithms:
+recursive backtracker (DFS), Kruskal, Wilson and Eller, plus an optional
+"braid" pass that removes dead ends. Difficulty scales with level number and
+the algorithm is chosen per theme (see ``data.levels_config``).
+
+The maze is carved into a flat row-major ``bytearray`` (index = y * width + x)
+with an explicit stack, so very large "challenge" mazes (2001x2001 and up)
+can be generated without hitting the recursion limit.
+
+Animal placement is pure Python: it rejection-samples flat indices, which
+costs O(animals) rather than a scan of the grid, so there is no NumPy path
+to keep in step with (Android builds ship without NumPy).
+
+Each generator owns a ``random.Random`` seeded from its level number (see
+``level_seed``), so a level always produces the same maze.
 """
+import hashlib
 import random
+import time
+from array import array
+from concurrent.futures import wait
+
+from data.levels_config import get_maze_style
+
+# UI thread budget for generate_best_of
+BEST_OF_BUDGET_MS = 40
+INF = float('inf')
+
+
+def level_seed(level: int, salt: str = '') -> int:
+    """Stable 64-bit seed for a level; change ``salt`` to reshuffle all mazes."""
+    digest = hashlib.blake2b(f'{salt}:{level}'.encode('utf-8'),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class EllerRows:
+    """Eller's algorithm, one row of rooms at a time in O(width) memory.
+
+    ``next_row()`` returns ``(right, down)`` bytearrays: ``right[x]`` opens
+    room x to room x + 1, ``down[x]`` opens room x to the next row.
+    """
+
+    def __init__(self, width: int, rng):
+        self.width = width
+        self.rng = rng
+        self._sets = list(range(width))
+        self._members = {i: [i] for i in range(width)}
+        self._next_id = width
+
+    def _join(self, a, b):
+        sets, members = self._sets, self._members
+        if len(members[a]) < len(members[b]):
+            a, b = b, a
+        for x in members[b]:
+            sets[x] = a
+        members[a].extend(members.pop(b))
+
+    def next_row(self, last: bool = False):
+        w, rng, sets = self.width, self.rng, self._sets
+        right = bytearray(max(w - 1, 0))
+        for x in range(w - 1):
+            if sets[x] != sets[x + 1] and (last or rng.random() < 0.5):
+                right[x] = 1
+                self._join(sets[x], sets[x + 1])
+        down = bytearray(w)
+        if last:
+            return right, down
+        # Every set continues downwards through at least one room
+        for members in self._members.values():
+            picked = [x for x in members if rng.random() < 0.5]
+            if not picked:
+                picked = [rng.choice(members)]
+            for x in picked:
+                down[x] = 1
+        members = {}
+        for x in range(w):
+            if not down[x]:
+                sets[x] = self._next_id
+                self._next_id += 1
+            members.setdefault(sets[x], []).append(x)
+        self._members = members
+        return right, down
+
+
+def difficulty_target(level: int) -> dict:
+    """Target ratios for ``MazeGenerator.metrics`` at ``level`` (1..300+).
+
+    Longer routes, more dead ends and more turns along the route as the
+    level rises; the maze area itself still grows via ``_size_for_level``.
+    """
+    t = min(max(level - 1, 0) / 299.0, 1.0)
+    return {
+        'solution_ratio': 0.20 + 0.10 * t,
+        'dead_end_ratio': 0.08 + 0.04 * t,
+        'turn_ratio':     0.25 + 0.15 * t,
+    }
+
+
+def profile_distance(metrics: dict, target: dict) -> float:
+    """Sum of squared relative errors over the keys of ``target``."""
+    return sum(((metrics[k] - v) / v) ** 2 if v else metrics[k] ** 2
+               for k, v in target.items())
+
+
+def _score_candidate(level, size, seed, algorithm, braid, target):
+    """(distance, built state). Module level so it can run in a process
+    pool; the state is what the winner's generator adopts."""
+    gen = MazeGenerator(level, size=size, seed=seed, algorithm=algorithm,
+                        braid=braid)
+    gen.build()
+    state = (seed, gen.rng.getstate(), gen.cells, gen.animal_positions,
+             gen._route)
+    return profile_distance(gen.metrics(), target), state
 
 
 class MazeGenerator:
@@ -12,11 +122,34 @@ class MazeGenerator:
     END    = 3
     ANIMAL = 4
 
-    def __init__(self, level: int = 1):
+    ALGORITHMS = ('backtracker', 'kruskal', 'wilson', 'eller')
+    # Share of animals placed on the start -> exit solution path
+    ANIMALS_ON_PATH = 0.5
+
+    def __init__(self, level: int = 1, size=None, seed=None, salt: str = '',
+                 algorithm=None, braid=None):
+        """``size`` = (width, height) overrides the level-based, capped size.
+        ``seed`` defaults to ``level_seed(level, salt)``. ``algorithm`` (one of
+        ALGORITHMS) and ``braid`` (share of dead ends to remove, 0..1)
+        default to the level's theme."""
+        style = get_maze_style(level)
+        self.algorithm = algorithm or style['algorithm']
+        if self.algorithm not in self.ALGORITHMS:
+            raise ValueError(f'unknown maze algorithm: {self.algorithm!r}')
+        self.braid = style['braid'] if braid is None else braid
         self.level = level
-        self.width, self.height = self._size_for_level(level)
-        self.grid = [[self.WALL] * self.width for _ in range(self.height)]
+        self.seed = level_seed(level, salt) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        if size is None:
+            self.width, self.height = self._size_for_level(level)
+        else:
+            self.width, self.height = self._odd_size(*size)
+        self.cells = bytearray([self.WALL]) * (self.width * self.height)
+        self.grid = []
         self.animal_positions = []
+        self._fields = {}
+        self._solution = None
+        self._route = None      # a start -> exit route, from the carve
         # Start is always top-left passable cell, end bottom-right
         self.start_pos = (1, 1)
         self.end_pos   = (self.width - 2, self.height - 2)
@@ -27,6 +160,11 @@ class MazeGenerator:
         base_h = 9  + (level // 10) * 2
         w = min(base_w, 25)
         h = min(base_h, 35)
+        return self._odd_size(w, h)
+
+    @staticmethod
+    def _odd_size(w, h):
+        w, h = max(int(w), 5), max(int(h), 5)
         # Enforce odd
         if w % 2 == 0: w += 1
         if h % 2 == 0: h += 1
@@ -34,46 +172,609 @@ class MazeGenerator:
 
     def generate(self) -> list:
         """Return grid with START, END and ANIMAL cells marked."""
+        self.build()
+        self.grid = self.rows()
+        return self.grid
+
+    def build(self) -> bytearray:
+        """Carve and mark the maze in the flat buffer only (no row lists)."""
+        w = self.width
         sx, sy = self.start_pos
+        self._fields, self._solution, self._route = {}, None, None
         self._carve(sx, sy)
+        if self._route is None:
+            self._route = self._find_route()
+        if self.braid > 0:
+            self._braid(self.braid)
         # Mark start / end
-        self.grid[sy][sx] = self.START
+        self.cells[sy * w + sx] = self.START
         ex, ey = self.end_pos
-        self.grid[ey][ex] = self.END
+        self.cells[ey * w + ex] = self.END
         self._place_animals()
+        return self.cells
+
+    def generate_best_of(self, n: int, target_profile=None,
+                         budget_ms=BEST_OF_BUDGET_MS, executor=None) -> list:
+        """Build up to ``n`` candidates and keep the one closest to
+        ``target_profile`` (default ``difficulty_target(level)``).
+
+        Candidate 0 uses this generator's own seed and is always built
+        in-process. Further candidates only start if one more should still
+        fit in ``budget_ms``; with an ``executor`` (e.g. a
+        ProcessPoolExecutor) they then all run there, only those done by
+        the deadline count, and the pool is never waited on past it. The
+        best finished candidate is kept as built, not rebuilt. Returns the
+        grid like ``generate()``.
+        """
+        target = target_profile or difficulty_target(self.level)
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        seeds = [self.seed] + [
+            (self.seed + i * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+            for i in range(1, max(n, 1))]
+        args = ((self.width, self.height), self.algorithm,
+                self.braid, target)
+        scored = []     # (distance, candidate index, state)
+        cost = 0.0
+        for i, s in enumerate(seeds):
+            # Only start a candidate that should finish within budget
+            t0 = time.perf_counter()
+            if scored and t0 + cost > deadline:
+                break
+            if scored and executor is not None:
+                # The rest run on the pool; take what is done by the deadline
+                pending = {executor.submit(_score_candidate, self.level,
+                                           args[0], rest, *args[1:]): j
+                           for j, rest in enumerate(seeds[i:], i)}
+                left = deadline - time.perf_counter()
+                done, late = wait(pending, timeout=None if left == INF
+                                  else max(left, 0))
+                scored += [(f.result()[0], pending[f], f.result()[1])
+                           for f in done]
+                for f in late:
+                    f.cancel()
+                break
+            distance, state = _score_candidate(self.level, args[0], s,
+                                               *args[1:])
+            scored.append((distance, i, state))
+            cost = time.perf_counter() - t0
+        # Ties go to the lower candidate index, whatever finished first
+        seed, rng_state, cells, animals, route = min(
+            scored, key=lambda item: item[:2])[2]
+        self.seed = seed
+        self.rng = random.Random()
+        self.rng.setstate(rng_state)
+        self.cells = bytearray(cells)
+        self.animal_positions = list(animals)
+        self._fields, self._solution, self._route = {}, None, route
+        self.grid = self.rows()
         return self.grid
 
+    @classmethod
+    def restore(cls, level, width, height, cells, start_pos, end_pos,
+                animal_positions):
+        """Rebuild a generated maze from stored data without carving."""
+        gen = cls(level, size=(width, height), seed=0,
+                  algorithm='backtracker', braid=0)
+        gen.cells = bytearray(cells)
+        gen.start_pos = tuple(start_pos)
+        gen.end_pos = tuple(end_pos)
+        gen.animal_positions = [tuple(p) for p in animal_positions]
+        w = gen.width
+        for x, y in gen.animal_positions:
+            gen.cells[y * w + x] = cls.ANIMAL
+        gen.cells[gen.start_pos[1] * w + gen.start_pos[0]] = cls.START
+        gen.cells[gen.end_pos[1] * w + gen.end_pos[0]] = cls.END
+        gen.grid = gen.rows()
+        return gen
+
+    def rows(self) -> list:
+        """Row-major list of lists view of the flat buffer (a copy)."""
+        w, cells = self.width, self.cells
+        return [list(cells[i:i + w]) for i in range(0, len(cells), w)]
+
+    def cell(self, x, y):
+        return self.cells[y * self.width + x]
+
+    # ── Carving strategies ───────────────────────────────────────────────
     def _carve(self, cx, cy):
-        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-        random.shuffle(directions)
-        self.grid[cy][cx] = self.PATH
-        for dx, dy in directions:
-            nx, ny = cx + dx, cy + dy
-            if 0 < nx < self.width - 1 and 0 < ny < self.height - 1:
-                if self.grid[ny][nx] == self.WALL:
-                    # Carve the wall between current and next
-                    self.grid[cy + dy // 2][cx + dx // 2] = self.PATH
-                    self._carve(nx, ny)
+        getattr(self, f'_carve_{self.algorithm}')(cx, cy)
 
-    def _place_animals(self):
-        num_animals = min(3 + self.level // 3, 12)
-        path_cells = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if self.grid[y][x] == self.PATH
-        ]
-        random.shuffle(path_cells)
-        sx, sy = self.start_pos
+    def _room_cell(self, room):
+        """Flat grid index of room number ``room`` (rooms are row-major)."""
+        rw = (self.width - 1) // 2
+        return (2 * (room // rw) + 1) * self.width + 2 * (room % rw) + 1
+
+    def _carve_backtracker(self, cx, cy):
+        # Carve in a copy of the grid padded by one PATH cell on every side:
+        # a room (odd x, odd y) counts as unvisited while it is still WALL, and
+        # the padding stops the walk at the border without any bounds tests.
+        w, h = self.width, self.height
+        pw = w + 2
+        buf = bytearray(pw * (h + 2))
+        for y in range(h):
+            buf[(y + 1) * pw + 1:(y + 2) * pw - 1] = self.cells[y * w:(y + 1) * w]
+        path = self.PATH
+        up, down = 2 * pw, -2 * pw
+        steps = (2, -2, up, down)
+        # pick[mask << 8 | byte] -> grid step, where mask has bit d set when
+        # the room in direction d is still unvisited; one random byte per step
+        pick = [0] * (16 * 256)
+        for mask in range(1, 16):
+            dirs = [steps[d] for d in range(4) if mask >> d & 1]
+            for b in range(256):
+                pick[mask << 8 | b] = dirs[b % len(dirs)]
+
+        g = (cy + 1) * pw + cx + 1
         ex, ey = self.end_pos
-        placed = 0
-        for (x, y) in path_cells:
-            if placed >= num_animals:
+        exit_g = (ey + 1) * pw + ex + 1
+        route = None
+        buf[g] = path
+        stack = []
+        push, pop = stack.append, stack.pop
+        noise = self.rng.randbytes((w // 2) * (h // 2) + 16)
+        n = 0
+        while True:
+            mask = (buf[g + 2] | buf[g - 2] << 1
+                    | buf[g + up] << 2 | buf[g + down] << 3)
+            if mask:
+                step = pick[mask << 8 | noise[n]]
+                n += 1
+                buf[g + (step >> 1)] = path
+                push(g)
+                g += step
+                buf[g] = path
+                if g == exit_g:
+                    # The DFS stack is the tree path from the start
+                    route = stack + [g]
+            elif stack:
+                g = pop()
+            else:
                 break
-            if (x, y) not in [(sx, sy), (ex, ey)]:
-                self.grid[y][x] = self.ANIMAL
-                self.animal_positions.append((x, y))
-                placed += 1
+
+        for y in range(h):
+            self.cells[y * w:(y + 1) * w] = buf[(y + 1) * pw + 1:(y + 2) * pw - 1]
+        if route is not None:
+            self._route = self._expand_route(
+                [(p // pw - 1) * w + p % pw - 1 for p in route])
+
+    def _carve_kruskal(self, cx, cy):
+        # Shuffled walls + array-based union-find (path halving, by size)
+        w = self.width
+        rw, rh = (self.width - 1) // 2, (self.height - 1) // 2
+        n = rw * rh
+        # Edge e = room * 2 + d: d 0 joins the room to its right, 1 to below
+        edges = [r * 2 for r in range(n) if r % rw != rw - 1]
+        edges += [r * 2 + 1 for r in range(n - rw)]
+        self.rng.shuffle(edges)
+        parent = list(range(n))
+        size = [1] * n
+        cells, path = self.cells, self.PATH
+        for r in range(n):
+            cells[self._room_cell(r)] = path
+        joined = 0
+        for e in edges:
+            a = e >> 1
+            b = a + (rw if e & 1 else 1)
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+            cells[self._room_cell(e >> 1) + (w if e & 1 else 1)] = path
+            joined += 1
+            if joined == n - 1:
+                break
+
+    def _carve_wilson(self, cx, cy):
+        # Loop-erased random walks: uniform over all spanning trees
+        w = self.width
+        rw, rh = (self.width - 1) // 2, (self.height - 1) // 2
+        n = rw * rh
+        rng = self.rng
+        cells, path = self.cells, self.PATH
+        in_tree = bytearray(n)
+        heading = [0] * n
+        root = (cy // 2) * rw + cx // 2
+        in_tree[root] = 1
+        cells[self._room_cell(root)] = path
+        steps = (1, -1, rw, -rw)
+        walls = (1, -1, w, -w)
+        for start in range(n):
+            if in_tree[start]:
+                continue
+            # Walk until the tree is hit; overwriting `heading` erases loops
+            r = start
+            while not in_tree[r]:
+                x, y = r % rw, r // rw
+                while True:
+                    d = rng.getrandbits(2)
+                    if ((d == 0 and x < rw - 1) or (d == 1 and x > 0)
+                            or (d == 2 and y < rh - 1) or (d == 3 and y > 0)):
+                        break
+                heading[r] = d
+                r += steps[d]
+            r = start
+            while not in_tree[r]:
+                in_tree[r] = 1
+                g = self._room_cell(r)
+                cells[g] = path
+                cells[g + walls[heading[r]]] = path
+                r += steps[heading[r]]
+        # Tree path: headings lead from the exit's room back to the root
+        ex, ey = self.end_pos
+        r = (ey // 2) * rw + ex // 2
+        rooms = [r]
+        while r != root:
+            r += steps[heading[r]]
+            rooms.append(r)
+        self._route = self._expand_route(
+            [self._room_cell(r) for r in reversed(rooms)])
+
+    def _carve_eller(self, cx, cy):
+        w = self.width
+        rw, rh = (self.width - 1) // 2, (self.height - 1) // 2
+        cells, path = self.cells, self.PATH
+        rows = EllerRows(rw, self.rng)
+        for ry in range(rh):
+            right, down = rows.next_row(last=(ry == rh - 1))
+            g = (2 * ry + 1) * w + 1
+            for rx in range(rw):
+                cells[g + 2 * rx] = path
+                if rx < rw - 1 and right[rx]:
+                    cells[g + 2 * rx + 1] = path
+                if down[rx]:
+                    cells[g + 2 * rx + w] = path
+
+    def _braid(self, fraction):
+        """Open walls at ``fraction`` of the dead ends, creating loops."""
+        w = self.width
+        rw, rh = (self.width - 1) // 2, (self.height - 1) // 2
+        cells, wall, path = self.cells, self.WALL, self.PATH
+        def closed_walls(g, x, y):
+            out = []
+            for dw, ok in ((1, x < rw - 1), (-1, x > 0),
+                           (w, y < rh - 1), (-w, y > 0)):
+                if ok and cells[g + dw] == wall:
+                    out.append(dw)
+            return out
+
+        def is_dead_end(g):
+            return (cells[g + 1] + cells[g - 1]
+                    + cells[g + w] + cells[g - w]) == 3 * wall
+
+        dead = [r for r in range(rw * rh) if is_dead_end(self._room_cell(r))]
+        self.rng.shuffle(dead)
+        for r in dead[:int(round(len(dead) * fraction))]:
+            g = self._room_cell(r)
+            if not is_dead_end(g):
+                continue  # already opened from its neighbour
+            options = closed_walls(g, r % rw, r // rw)
+            if not options:
+                continue
+            # Prefer joining two dead ends so one wall removes both
+            best = [dw for dw in options if is_dead_end(g + 2 * dw)]
+            cells[g + self.rng.choice(best or options)] = path
+
+    # ── Routes ───────────────────────────────────────────────────────────
+    def _expand_route(self, rooms):
+        """Room cells of a route -> every cell, with the walls between."""
+        route = rooms[:1]
+        for a, b in zip(rooms, rooms[1:]):
+            route += ((a + b) >> 1, b)
+        return route
+
+    def _find_route(self):
+        """Start -> exit route for carvers that don't yield one: a DFS over
+        rooms that stops at the exit and tries exit-ward doors first (on a
+        perfect maze the only route, i.e. the solution path)."""
+        w, cells, wall = self.width, self.cells, self.WALL
+        sx, sy = self.start_pos
+        ex, ey = self.end_pos
+        start, goal = sy * w + sx, ey * w + ex
+        seen = bytearray(len(cells))
+        seen[start] = 1
+        # Right and down lead towards the exit (bottom-right)
+        doors = (1, w, -1, -w)
+        stack, tried = [start], [0]
+        while stack:
+            g = stack[-1]
+            if g == goal:
+                return self._expand_route(stack)
+            d = tried[-1]
+            while d < 4:
+                door = doors[d]
+                d += 1
+                n = g + 2 * door
+                if cells[g + door] != wall and not seen[n]:
+                    break
+            else:
+                stack.pop()
+                tried.pop()
+                continue
+            tried[-1] = d
+            seen[n] = 1
+            stack.append(n)
+            tried.append(0)
+        return []
+
+    def _route_cuts(self):
+        """Cells every start -> exit route passes through, in route order
+        (ends excluded). On a perfect maze that is the carve route; on a
+        braided one, the cut cells found by Tarjan's low-links over a DFS
+        from the start."""
+        route = self._route[1:-1]
+        if not self.braid:
+            return route
+        w, cells, wall = self.width, self.cells, self.WALL
+        sx, sy = self.start_pos
+        ex, ey = self.end_pos
+        start, goal = sy * w + sx, ey * w + ex
+        order = array('i', [0]) * len(cells)     # DFS order, 0 = unseen
+        low = array('i', [0]) * len(cells)
+        parent = array('i', [-1]) * len(cells)
+        order[start] = low[start] = t = 1
+        steps = (1, w, -1, -w)
+        stack, tried = [start], [0]
+        while stack:
+            g = stack[-1]
+            d = tried[-1]
+            if d == 4:
+                stack.pop()
+                tried.pop()
+                if stack and low[g] < low[stack[-1]]:
+                    low[stack[-1]] = low[g]
+                continue
+            tried[-1] = d + 1
+            n = g + steps[d]
+            if cells[n] == wall:
+                continue
+            if not order[n]:
+                t += 1
+                order[n] = low[n] = t
+                parent[n] = g
+                stack.append(n)
+                tried.append(0)
+            elif n != parent[g] and order[n] < low[g]:
+                low[g] = order[n]
+        if not order[goal]:
+            return []
+        # Walk up from the exit: v cuts it off the start when no back edge
+        # from the exit's side climbs above v
+        cuts, child, v = [], goal, parent[goal]
+        while v != start:
+            if low[child] >= order[v]:
+                cuts.append(v)
+            child, v = v, parent[v]
+        cuts.reverse()
+        return cuts
+
+    def _route_cut_set(self, limit):
+        """At most ``limit`` cells that together block every start -> exit
+        route, or [] if that takes more: a minimum vertex cut from unit
+        augmenting paths (each cell carries one path at most)."""
+        w, cells, wall = self.width, self.cells, self.WALL
+        sx, sy = self.start_pos
+        ex, ey = self.end_pos
+        start, goal = sy * w + sx, ey * w + ex
+        used = bytearray(len(cells))    # a path runs through the cell
+        flow = {}                       # (a, b): a path steps from a to b
+        steps = (1, w, -1, -w)
+
+        def search():
+            # BFS over (cell, side): side 0 enters a cell, side 1 leaves it
+            prev = {(start, 1): None}
+            frontier = [(start, 1)]
+            while frontier:
+                nxt = []
+                for node in frontier:
+                    g, side = node
+                    if side:
+                        moves = [(g + s, 0) for s in steps
+                                 if cells[g + s] != wall]
+                        if used[g] and g != start:
+                            moves.append((g, 0))
+                    else:
+                        moves = [(n, 1) for n in (g + s for s in steps)
+                                 if flow.get((n, g))]
+                        if not used[g] or g == goal:
+                            moves.append((g, 1))
+                    for m in moves:
+                        if m not in prev:
+                            prev[m] = node
+                            nxt.append(m)
+                frontier = nxt
+            return prev
+
+        for _ in range(limit + 1):
+            prev = search()
+            node = (goal, 1)
+            if node not in prev:
+                # Cut: cells entered but not left by the last search
+                return [g for g, side in prev
+                        if not side and (g, 1) not in prev]
+            while prev[node] is not None:
+                (a, a_side), (b, b_side) = prev[node], node
+                if a == b:
+                    used[a] = b_side    # through the cell, or undone
+                elif flow.get((b, a)):
+                    flow[(b, a)] -= 1
+                else:
+                    flow[(a, b)] = flow.get((a, b), 0) + 1
+                node = prev[node]
+        return []
+
+    # ── Distance fields / solution ───────────────────────────────────────
+    def distance_field(self, origin=None) -> array:
+        """Flat BFS step counts from ``origin`` (default start), -1 = unreached.
+
+        Only walls block, so the field stays valid after animals are placed
+        or defeated; it is cached until the maze is rebuilt.
+        """
+        origin = tuple(origin or self.start_pos)
+        field = self._fields.get(origin)
+        if field is None:
+            field = self._fields[origin] = self._bfs(origin)
+        return field
+
+    def _bfs(self, origin):
+        w, cells, wall = self.width, self.cells, self.WALL
+        dist = array('i', [-1]) * len(cells)
+        g = origin[1] * w + origin[0]
+        dist[g] = 0
+        frontier, d = [g], 0
+        # The border is all wall, so g +/- 1 and g +/- w never leave the grid
+        while frontier:
+            d += 1
+            nxt = []
+            for g in frontier:
+                for n in (g + 1, g - 1, g + w, g - w):
+                    if dist[n] < 0 and cells[n] != wall:
+                        dist[n] = d
+                        nxt.append(n)
+            frontier = nxt
+        return dist
+
+    def solution_path(self) -> list:
+        """Shortest start -> end route as (x, y) cells, both ends included."""
+        if self._solution is None and self._route and not self.braid:
+            # A perfect maze has one route: the carve's
+            w = self.width
+            self._solution = [(i % w, i // w) for i in self._route]
+        if self._solution is None:
+            w = self.width
+            to_end = self.distance_field(self.end_pos)
+            g = self.start_pos[1] * w + self.start_pos[0]
+            route = [g] if to_end[g] >= 0 else []
+            while route and to_end[g] > 0:
+                g = next(n for n in (g + 1, g - 1, g + w, g - w)
+                         if to_end[n] == to_end[g] - 1)
+                route.append(g)
+            self._solution = [(i % w, i // w) for i in route]
+        return self._solution
+
+    def solution_length(self) -> int:
+        """Steps on the shortest start -> end route (-1 if unreachable)."""
+        ex, ey = self.end_pos
+        return self.distance_field()[ey * self.width + ex]
+
+    def next_step(self, pos):
+        """Neighbour of ``pos`` one step closer to the exit (hint), or None."""
+        w = self.width
+        to_end = self.distance_field(self.end_pos)
+        g = pos[1] * w + pos[0]
+        if to_end[g] <= 0:
+            return None
+        for n in (g + 1, g - 1, g + w, g - w):
+            if to_end[n] == to_end[g] - 1:
+                return (n % w, n // w)
+        return None
+
+    def dead_ends(self) -> list:
+        """Open cells with exactly one open neighbour."""
+        w, cells, wall = self.width, self.cells, self.WALL
+        out = []
+        for g in range(w + 1, len(cells) - w - 1):
+            if cells[g] != wall and ((cells[g + 1] == wall) + (cells[g - 1] == wall)
+                                     + (cells[g + w] == wall)
+                                     + (cells[g - w] == wall)) == 3:
+                out.append((g % w, g // w))
+        return out
+
+    # ── Difficulty metrics ───────────────────────────────────────────────
+    def metrics(self) -> dict:
+        """Difficulty measures from one scan of the cells plus the route.
+
+        dead_ends: open cells with one open neighbour; branching: share of
+        open cells with 3+ open neighbours (junctions); river: share of open
+        cells that are plain corridor (exactly 2), i.e. how long passages
+        flow before splitting; turns: direction changes along the solution.
+        """
+        w, cells, wall = self.width, self.cells, self.WALL
+        open_cells = dead = corridor = junction = 0
+        for g in range(w + 1, len(cells) - w - 1):
+            if cells[g] == wall:
+                continue
+            open_cells += 1
+            deg = ((cells[g + 1] != wall) + (cells[g - 1] != wall)
+                   + (cells[g + w] != wall) + (cells[g - w] != wall))
+            if deg == 1:
+                dead += 1
+            elif deg == 2:
+                corridor += 1
+            elif deg > 2:
+                junction += 1
+        route = self.solution_path()
+        turns = 0
+        for (ax, ay), (bx, by), (cx, cy) in zip(route, route[1:], route[2:]):
+            if (bx - ax, by - ay) != (cx - bx, cy - by):
+                turns += 1
+        length = max(len(route) - 1, 0)
+        total = max(open_cells, 1)
+        return {
+            'solution_length': length,
+            'dead_ends': dead,
+            'branching': junction / total,
+            'river': corridor / total,
+            'turns': turns,
+            'open_cells': open_cells,
+            'solution_ratio': length / total,
+            'dead_end_ratio': dead / total,
+            'turn_ratio': turns / max(length, 1),
+        }
+
+    # ── Animals ───────────────────────────────────────────────────────────
+    def expected_animals(self) -> int:
+        return min(3 + self.level // 3, 12)
+
+    def _place_animals(self):
+        # START / END are already marked, so every PATH cell is a candidate.
+        # A share goes on the solution path so the child meets some animals
+        # even on the shortest route to the exit.
+        num_animals = self.expected_animals()
+        w = self.width
+        k = int(round(num_animals * self.ANIMALS_ON_PATH))
+        # Cells no start -> exit route avoids (the carve route itself when
+        # the maze is perfect)
+        cuts = self._route_cuts()
+        if cuts:
+            on_path = self.rng.sample(cuts, min(k, len(cuts)))
+        else:
+            # No single cell blocks a braided maze: block it with a small
+            # cut set if the share covers one, else use the carve route
+            route = self._route[1:-1]
+            on_path = self._route_cut_set(k) or self.rng.sample(
+                route, min(k, len(route)))
+        for i in on_path:
+            self.cells[i] = self.ANIMAL
+        chosen = self._pick_path_cells(num_animals - len(on_path))
+        for i in chosen:
+            self.cells[i] = self.ANIMAL
+        chosen = on_path + chosen
+        self.animal_positions = [(i % w, i // w) for i in chosen]
+
+    def _pick_path_cells(self, k):
+        # Rejection-sample flat indices: about half of all cells are PATH, so
+        # this costs O(k) instead of scanning and shuffling the whole grid.
+        cells, path = self.cells, self.PATH
+        size = len(cells)
+        chosen, taken = [], set()
+        for _ in range(k * 32):
+            if len(chosen) >= k:
+                return chosen
+            i = self.rng.randrange(size)
+            if cells[i] == path and i not in taken:
+                taken.add(i)
+                chosen.append(i)
+        # Unlucky or nearly full maze: fall back to an exact scan
+        rest = [i for i, v in enumerate(cells) if v == path and i not in taken]
+        return chosen + self.rng.sample(rest, min(k - len(chosen), len(rest)))
 
     def get_animal_count(self):
         return len(self.animal_positions)
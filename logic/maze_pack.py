@@ -0,0 +1,206 @@
+"""
+Prebuilt binary maze pack.
+
+All levels are generated once at build time (``python -m tools.build_levels``)
+and stored in one file; at runtime the file is mmap'ed and a level is a
+single offset lookup plus a few hundred bytes of unpacking.
+
+The pack records the salt its levels were generated with (as a CRC-32);
+``load_level`` only serves a level from the pack for that same salt.
+
+Layout (little-endian):
+    header   magic 'MFMP', format version u16, reserved u16, revision u32,
+             first level u32, count u32, salt CRC-32 u32
+    offsets  count x u32, absolute byte offset of each record
+    record   width, height, sx, sy, ex, ey, n_animals (u16 each),
+             n_animals x (x u16, y u16),
+             walls: width * height bits, row-major, LSB first, 1 = wall
+"""
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from logic.maze_gen import MazeGenerator
+
+MAGIC = b'MFMP'
+VERSION = 3
+PACK_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         'data', 'mazes.pack')
+
+_HEADER = struct.Struct('<4sHHIIII')
+_RECORD = struct.Struct('<7H')
+_POINT = struct.Struct('<HH')
+
+# byte -> the 8 cells it encodes (1 = WALL, 0 = PATH)
+_EXPAND = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+def salt_id(salt: str) -> int:
+    return zlib.crc32(salt.encode('utf-8'))
+
+
+def encode(gen: MazeGenerator) -> bytes:
+    """Serialize a generated maze to one pack record."""
+    w, h = gen.width, gen.height
+    (sx, sy), (ex, ey) = gen.start_pos, gen.end_pos
+    out = bytearray(_RECORD.pack(w, h, sx, sy, ex, ey,
+                                 len(gen.animal_positions)))
+    for x, y in gen.animal_positions:
+        out += _POINT.pack(x, y)
+    walls = bytearray((w * h + 7) // 8)
+    wall = MazeGenerator.WALL
+    for i, v in enumerate(gen.cells):
+        if v == wall:
+            walls[i >> 3] |= 1 << (i & 7)
+    out += walls
+    return bytes(out)
+
+
+def decode(level: int, buf, offset: int = 0) -> MazeGenerator:
+    """Rebuild a MazeGenerator from the record at ``offset`` in ``buf``."""
+    w, h, sx, sy, ex, ey, n = _RECORD.unpack_from(buf, offset)
+    offset += _RECORD.size
+    animals = [_POINT.unpack_from(buf, offset + i * _POINT.size)
+               for i in range(n)]
+    offset += n * _POINT.size
+    size = w * h
+    packed = buf[offset:offset + (size + 7) // 8]
+    cells = b''.join([_EXPAND[b] for b in packed])[:size]
+    return MazeGenerator.restore(level, w, h, cells, (sx, sy), (ex, ey),
+                                 animals)
+
+
+def write_pack(path: str, records, first_level: int = 1, revision: int = 0,
+               salt: str = ''):
+    """Write pre-encoded records (consecutive levels) to ``path``.
+
+    ``revision`` identifies the content build (e.g. generator changes).
+    """
+    records = list(records)
+    offset = _HEADER.size + 4 * len(records)
+    offsets = []
+    for rec in records:
+        offsets.append(offset)
+        offset += len(rec)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, revision, first_level,
+                             len(records), salt_id(salt)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for rec in records:
+            f.write(rec)
+    os.replace(tmp, path)
+
+
+# ── Building ─────────────────────────────────────────────────────────────
+def build_level(level: int, salt: str = '', best_of: int = 1,
+                inspect=None):
+    """Worker: (level, record, seconds, ``inspect(gen)`` or None)."""
+    t0 = time.perf_counter()
+    gen = MazeGenerator(level=level, salt=salt)
+    if best_of > 1:
+        # Offline: no latency budget, try every candidate
+        gen.generate_best_of(best_of, budget_ms=float('inf'))
+    else:
+        gen.build()
+    info = inspect(gen) if inspect is not None else None
+    return level, encode(gen), time.perf_counter() - t0, info
+
+
+def _build_level_args(args):
+    return build_level(*args)
+
+
+def build_records(levels, salt: str = '', best_of: int = 1, jobs: int = 1,
+                  inspect=None) -> list:
+    """``build_level`` results for ``levels``, in order, on ``jobs``
+    processes (``inspect`` must then be a picklable module-level function)."""
+    work = [(level, salt, best_of, inspect) for level in levels]
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunk = max(1, len(work) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_build_level_args, work, chunksize=chunk))
+    return [build_level(*w) for w in work]
+
+
+def build_pack(path: str = PACK_FILE, levels=range(1, 301), salt: str = '',
+               revision: int = 0, best_of: int = 1, jobs: int = 1) -> list:
+    """Generate ``levels`` and write the pack; returns the build results
+    (``tools.build_levels`` adds validation and reporting)."""
+    levels = list(levels)
+    results = build_records(levels, salt, best_of, jobs)
+    write_pack(path, [rec for _, rec, _, _ in results],
+               first_level=levels[0] if levels else 1, revision=revision,
+               salt=salt)
+    return results
+
+
+class MazePack:
+    """Read-only, mmap-backed view of a maze pack file."""
+
+    def __init__(self, path: str = PACK_FILE):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+            (magic, version, _, revision, first, count,
+             salt) = _HEADER.unpack_from(self._mm, 0)
+        except Exception:
+            self._file.close()
+            raise
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'not a v{VERSION} maze pack: {path}')
+        self.revision = revision
+        self.first_level = first
+        self.count = count
+        self.salt_id = salt
+
+    def __contains__(self, level):
+        return self.first_level <= level < self.first_level + self.count
+
+    def __len__(self):
+        return self.count
+
+    def load(self, level: int) -> MazeGenerator:
+        if level not in self:
+            raise KeyError(level)
+        idx = level - self.first_level
+        (offset,) = struct.unpack_from('<I', self._mm, _HEADER.size + 4 * idx)
+        return decode(level, self._mm, offset)
+
+    def close(self):
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+_default = None
+
+
+def default_pack():
+    """Shared MazePack for ``data/mazes.pack``, or None when it isn't built."""
+    global _default
+    if _default is None:
+        try:
+            _default = MazePack(PACK_FILE)
+        except (OSError, ValueError):
+            return None
+    return _default
+
+
+def load_level(level: int, salt: str = '') -> MazeGenerator:
+    """Maze for ``level``: from the pack if it holds the level for this
+    ``salt``, else generated live."""
+    pack = default_pack()
+    if pack is not None and level in pack and pack.salt_id == salt_id(salt):
+        return pack.load(level)
+    gen = MazeGenerator(level=level, salt=salt)
+    gen.generate()
+    return gen
+
@@ -0,0 +1,141 @@
+"""
+Child profiles.
+
+A small index file (``profiles.json``: id, name, avatar and last played per
+profile, plus the current one) is all that is read at startup. Each
+profile's save lives in its own directory and is loaded only when the
+profile is selected, so startup cost does not grow with the number of
+profiles and switching never touches the other profiles' saves.
+
+The first profile uses the data directory itself, so a save from before
+profiles existed becomes that profile's save unchanged.
+"""
+import json
+import os
+import time
+
+from logic.save_backends import JsonBackend, SqliteBackend, sqlite3
+from logic.save_system import SAVE_DB, SAVE_FILE, SaveSystem
+
+PROFILES_FILE = 'profiles.json'
+PROFILES_DIR = 'profiles'
+DEFAULT_NAME = 'Player 1'
+DEFAULT_AVATAR = 'princess'
+
+
+def default_backend(directory: str):
+    """SQLite when available (a JSON save there is migrated once),
+    otherwise the JSON file."""
+    if sqlite3 is None:
+        return JsonBackend(os.path.join(directory, SAVE_FILE))
+    return SqliteBackend(os.path.join(directory, SAVE_DB),
+                         migrate_from=os.path.join(directory, SAVE_FILE))
+
+
+class ProfileManager:
+
+    def __init__(self, root: str, backend_factory=default_backend):
+        self.root = root
+        self.path = os.path.join(root, PROFILES_FILE)
+        self.backend_factory = backend_factory
+        self.profiles = []      # [{'id', 'name', 'avatar', 'last_played'}]
+        self.current_id = None
+        self._save = None       # SaveSystem of the current profile
+
+    def load(self):
+        """Read the index only; creates the first profile if there is none."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self.profiles = list(index['profiles'])
+            self.current_id = index.get('current')
+        except (OSError, ValueError, KeyError, TypeError):
+            self.profiles = []
+        if not self.profiles:
+            self.profiles = [self._entry('p1', DEFAULT_NAME, DEFAULT_AVATAR)]
+            self.current_id = 'p1'
+            self._write_index()
+        if self.get(self.current_id) is None:
+            self.current_id = self.profiles[0]['id']
+
+    def get(self, profile_id):
+        for profile in self.profiles:
+            if profile['id'] == profile_id:
+                return profile
+        return None
+
+    @property
+    def current(self) -> dict:
+        return self.get(self.current_id)
+
+    def directory(self, profile_id: str) -> str:
+        if profile_id == 'p1':
+            return self.root
+        return os.path.join(self.root, PROFILES_DIR, profile_id)
+
+    # ── Saves ────────────────────────────────────────────────────────────
+    def current_save(self) -> SaveSystem:
+        """The current profile's save, loaded on first use."""
+        if self._save is None:
+            directory = self.directory(self.current_id)
+            os.makedirs(directory, exist_ok=True)
+            save = SaveSystem(os.path.join(directory, SAVE_FILE),
+                              backend=self.backend_factory(directory))
+            save.load()
+            self._save = save
+        return self._save
+
+    def select(self, profile_id: str) -> SaveSystem:
+        """Switch profiles: the old save is flushed and closed, only the
+        new one is read."""
+        if self.get(profile_id) is None:
+            raise KeyError(profile_id)
+        if profile_id != self.current_id:
+            self.close()
+            self.current_id = profile_id
+        self.current['last_played'] = int(time.time())
+        self._write_index()
+        return self.current_save()
+
+    def create(self, name: str, avatar: str = DEFAULT_AVATAR) -> dict:
+        n = len(self.profiles) + 1
+        while self.get(f'p{n}') is not None:
+            n += 1
+        profile = self._entry(f'p{n}', name, avatar)
+        self.profiles.append(profile)
+        self._write_index()
+        return profile
+
+    def rename(self, profile_id: str, name: str = None, avatar: str = None):
+        profile = self.get(profile_id)
+        if name is not None:
+            profile['name'] = name
+        if avatar is not None:
+            profile['avatar'] = avatar
+        self._write_index()
+
+    def flush(self):
+        if self._save is not None:
+            self._save.flush()
+
+    def close(self):
+        if self._save is not None:
+            self._save.close()
+            self._save = None
+
+    # ── Index ────────────────────────────────────────────────────────────
+    @staticmethod
+    def _entry(profile_id, name, avatar):
+        return {'id': profile_id, 'name': name, 'avatar': avatar,
+                'last_played': 0}
+
+    def _write_index(self):
+        tmp = self.path + '.tmp'
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'current': self.current_id,
+                           'profiles': self.profiles}, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
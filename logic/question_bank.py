@@ -0,0 +1,305 @@
+"""
+Precomputed question bank.
+
+The question space is split into tables keyed by (age group, level band,
+kind). Small spaces are enumerated completely (e.g. the 81 ``a + b`` pairs
+for ages 5-7), large ones are sampled down to ``SAMPLE_CAP`` draws. Each
+table stores interned question strings, answers, three precomputed wrong
+answers, the packed fact (``logic.review``), a weight and the lowest level
+whose operand ranges hold the entry, and serves O(1) draws (uniform, or
+Vose's alias method when weights differ).
+
+A band's table covers its top level's (widest) ranges; a draw for a lower
+level rejects entries out of that level's ranges, so banked questions
+follow exactly the same distribution as live generation. Open-ended kinds
+(algebra, sequences) are not banked; ``QuestionGenerator`` generates those live.
+
+Tables are built lazily on first use, or loaded from ``data/question_bank.bin``
+(``python -m tools.build_question_bank``).
+"""
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+
+from logic.distractors import make_distractors, spread_for
+from logic.review import pack_fact
+from logic.question_gen import (ADD, SUB, MUL, DIV, POW, SQRT, PERCENT,
+                                GEOMETRY, PERCENTS, format_question,
+                                typed_mistakes)
+
+BANK_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         'data', 'question_bank.bin')
+MAGIC = b'MFQB'
+VERSION = 3
+SAMPLE_CAP = 2048
+BAND_SIZE = 5
+# Draws tried for an entry within the level's ranges before going live
+MAX_TRIES = 16
+# Level beyond which an age group's operand ranges stop growing
+_LEVEL_CAP = {'5-7': 1, '8-10': 30, '11-13': 96, '14+': 1}
+
+BANKED_KINDS = {
+    '5-7':   (ADD,),
+    '8-10':  (ADD, SUB, MUL),
+    '11-13': (ADD, SUB, MUL, DIV, POW, SQRT),
+    '14+':   (PERCENT, GEOMETRY),
+}
+
+
+def capped(age_group: str, level: int) -> int:
+    """``level`` clamped to the last level whose ranges still grow."""
+    return min(max(level, 1), _LEVEL_CAP.get(age_group, 1))
+
+
+def band_of(age_group: str, level: int) -> int:
+    return capped(age_group, level) // BAND_SIZE
+
+
+def band_levels(age_group: str, band: int) -> range:
+    """Levels served by ``band`` (after capping)."""
+    return range(max(band * BAND_SIZE, 1),
+                 min(band * BAND_SIZE + BAND_SIZE - 1,
+                     _LEVEL_CAP.get(age_group, 1)) + 1)
+
+
+def _space(age_group, level, kind):
+    """(xs, ys, spec(x, y) -> (a, b, c, answer, max_val)) for one table;
+    mirrors QuestionGenerator._gen_* and data/curriculum.json."""
+    if age_group == '5-7':
+        return range(1, 10), range(1, 10), lambda x, y: (x, y, 0, x + y, 15)
+    if age_group == '8-10':
+        m = min(10 + level * 3, 100)
+        if kind == MUL:
+            r = range(2, min(10, m) + 1)
+            return r, r, lambda x, y: (x, y, 0, x * y, max(x * y * 2, 20))
+        r = range(1, m + 1)
+        if kind == ADD:
+            return r, r, lambda x, y: (x, y, 0, x + y, max((x + y) * 2, 20))
+        return r, r, lambda x, y: (max(x, y), min(x, y), 0, abs(x - y),
+                                   max(abs(x - y) * 2, 20))
+    if age_group == '11-13':
+        m = min(20 + level * 5, 500)
+        if kind in (ADD, SUB):
+            r = range(10, m + 1)
+            if kind == ADD:
+                return r, r, lambda x, y: (x, y, 0, x + y, max((x + y) * 3, 30))
+            return r, r, lambda x, y: (max(x, y), min(x, y), 0, abs(x - y),
+                                       max(abs(x - y) * 3, 30))
+        if kind == MUL:
+            r = range(2, 21)
+            return r, r, lambda x, y: (x, y, 0, x * y, max(x * y * 3, 30))
+        if kind == DIV:
+            return range(2, 13), range(2, 21), \
+                lambda x, y: (x * y, x, 0, y, max(y * 3, 30))
+        if kind == POW:
+            return range(2, 11), range(2, 4), \
+                lambda x, y: (x, y, 0, x ** y, max(x ** y * 3, 30))
+        return range(2, 16), range(1), lambda x, y: (x * x, 0, 0, x, max(x * 3, 30))
+    if kind == PERCENT:
+        return PERCENTS, range(20, 201), \
+            lambda x, y: (x, y, 0, y * x // 100, y)
+    r = range(3, 21)
+    return r, r, lambda x, y: (x, y, 0, x * y, x * y * 2 + 10)
+
+
+class QuestionTable:
+    """Array-backed entries of one (age group, band, kind) table."""
+
+    def __init__(self, text_idx, answer, wrong, fact, weight, level, strings):
+        self.text_idx = text_idx    # array('I'), index into `strings`
+        self.answer = answer        # array('i')
+        self.wrong = wrong          # array('i'), 3 per entry
+        self.fact = fact            # array('Q'), packed (kind, a, b, c)
+        self.weight = weight        # array('I')
+        self.level = level          # array('H'), lowest level in range
+        self.strings = strings
+        self._alias = None
+
+    def __len__(self):
+        return len(self.answer)
+
+    @classmethod
+    def build(cls, age_group, band, kind, strings, interned, floor=0):
+        levels = band_levels(age_group, band)
+        xs, ys, spec = _space(age_group, levels[-1], kind)
+        # Operand ranges of each level in the band, lowest first
+        ranges = [(lvl, *_space(age_group, lvl, kind)[:2]) for lvl in levels]
+        size = len(xs) * len(ys)
+        idx = (range(size) if size <= SAMPLE_CAP
+               else (random.randrange(size) for _ in range(SAMPLE_CAP)))
+        counts, need = {}, {}
+        for i in idx:
+            x, y = xs[i // len(ys)], ys[i % len(ys)]
+            key = spec(x, y)
+            counts[key] = counts.get(key, 0) + 1
+            if key not in need:
+                need[key] = next(lvl for lvl, lx, ly in ranges
+                                 if x in lx and y in ly)
+        table = cls(array('I'), array('i'), array('i'), array('Q'),
+                    array('I'), array('H'), strings)
+        for key, n in counts.items():
+            a, b, c, answer, max_val = key
+            text = format_question(kind, a, b, c)
+            if text not in interned:
+                interned[text] = len(strings)
+                strings.append(sys.intern(text))
+            table.text_idx.append(interned[text])
+            table.answer.append(answer)
+            table.wrong.extend(make_distractors(
+                answer, 3, spread_for(max_val), floor,
+                typed_mistakes(kind, a, b, answer)))
+            table.fact.append(pack_fact(kind, a, b, c))
+            table.weight.append(n)
+            table.level.append(need[key])
+        return table
+
+    def _build_alias(self):
+        # Vose's alias method; None when all weights are equal
+        n = len(self.weight)
+        if n == 0 or min(self.weight) == max(self.weight):
+            return None
+        total = float(sum(self.weight))
+        prob = [w * n / total for w in self.weight]
+        alias = [0] * n
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+        return prob, alias
+
+    def draw_index(self, rng=random) -> int:
+        if self._alias is None:
+            self._alias = self._build_alias() or False
+        i = rng.randrange(len(self.answer))
+        if self._alias and rng.random() >= self._alias[0][i]:
+            i = self._alias[1][i]
+        return i
+
+    def question(self, i: int, qtype: str = 'mcq', rng=random) -> dict:
+        answer = self.answer[i]
+        choices = list(self.wrong[3 * i:3 * i + 3])
+        choices.insert(rng.randrange(4), answer)
+        return {
+            'question': self.strings[self.text_idx[i]],
+            'answer': answer,
+            'choices': [str(c) for c in choices],
+            'type': qtype,
+            'fact': self.fact[i]
+        }
+
+
+class QuestionBank:
+    def __init__(self):
+        self.tables = {}
+        self.strings = []
+        self._interned = {}
+
+    def table(self, age_group: str, level: int, kind: int):
+        """Table for a draw, built on first use; None if ``kind`` is live-only."""
+        if kind not in BANKED_KINDS.get(age_group, ()):
+            return None
+        key = (age_group, band_of(age_group, level), kind)
+        table = self.tables.get(key)
+        if table is None:
+            floor = 1 if age_group == '5-7' else 0
+            table = self.tables[key] = QuestionTable.build(
+                age_group, key[1], kind, self.strings, self._interned, floor)
+        return table
+
+    def draw(self, age_group: str, level: int, kind: int, rng=random):
+        """A question dict, or None when ``kind`` must be generated live."""
+        table = self.table(age_group, level, kind)
+        if table is None or not len(table):
+            return None
+        qtype = 'addition' if age_group == '5-7' else 'mcq'
+        level = capped(age_group, level)
+        for _ in range(MAX_TRIES):
+            i = table.draw_index(rng)
+            if table.level[i] <= level:
+                return table.question(i, qtype, rng)
+        return None
+
+    def build_all(self):
+        for age_group, kinds in BANKED_KINDS.items():
+            for band in range(band_of(age_group, 10 ** 6) + 1):
+                for kind in kinds:
+                    self.table(age_group, max(band * BAND_SIZE, 1), kind)
+        return self
+
+    # ── File I/O ──────────────────────────────────────────────────────────
+    def save(self, path: str = BANK_FILE):
+        """Header JSON (table directory) + raw arrays + string blob."""
+        blobs, directory, offset = [], [], 0
+        for (age_group, band, kind), t in self.tables.items():
+            block = (t.text_idx.tobytes() + t.answer.tobytes()
+                     + t.wrong.tobytes() + t.fact.tobytes()
+                     + t.weight.tobytes() + t.level.tobytes())
+            directory.append([age_group, band, kind, len(t), offset])
+            blobs.append(block)
+            offset += len(block)
+        text = '\n'.join(self.strings).encode('utf-8')
+        header = json.dumps({'version': VERSION, 'tables': directory,
+                             'strings': [offset, len(text)]}).encode('utf-8')
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for block in blobs:
+                f.write(block)
+            f.write(text)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = BANK_FILE) -> 'QuestionBank':
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if raw[:4] != MAGIC:
+            raise ValueError(f'not a question bank: {path}')
+        (hlen,) = struct.unpack_from('<I', raw, 4)
+        header = json.loads(raw[8:8 + hlen].decode('utf-8'))
+        if header.get('version') != VERSION:
+            raise ValueError(f'unsupported question bank version: {path}')
+        body = memoryview(raw)[8 + hlen:]
+        bank = cls()
+        s_off, s_len = header['strings']
+        text = bytes(body[s_off:s_off + s_len]).decode('utf-8')
+        bank.strings = [sys.intern(s) for s in text.split('\n')] if text else []
+        bank._interned = {s: i for i, s in enumerate(bank.strings)}
+
+        def take(code, n, pos):
+            arr = array(code)
+            arr.frombytes(body[pos:pos + n * arr.itemsize])
+            return arr, pos + n * arr.itemsize
+
+        for age_group, band, kind, n, pos in header['tables']:
+            text_idx, pos = take('I', n, pos)
+            answer, pos = take('i', n, pos)
+            wrong, pos = take('i', 3 * n, pos)
+            fact, pos = take('Q', n, pos)
+            weight, pos = take('I', n, pos)
+            level, pos = take('H', n, pos)
+            bank.tables[(age_group, band, kind)] = QuestionTable(
+                text_idx, answer, wrong, fact, weight, level, bank.strings)
+        return bank
+
+
+_default = None
+
+
+def default_bank() -> QuestionBank:
+    """Shared bank: loaded from ``data/question_bank.bin`` when present,
+    otherwise built table by table on demand."""
+    global _default
+    if _default is None:
+        try:
+            _default = QuestionBank.load(BANK_FILE)
+        except (OSError, ValueError):
+            _default = QuestionBank()
+    return _default
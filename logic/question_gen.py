@@ -4,156 +4,434 @@ Math question generator for 4 age groups.
 8-10 : +, -, x up to 100
 11-13: +, -, x, /, powers, sqrt
 14+  : algebra, fractions, percent, geometry, sequences
+
+The 14+ kinds are templates from ``data/curriculum.json``
+(``logic.curriculum``); the others are ``_gen_*`` methods. Both draw one
+question *spec*
+``(kind, a, b, c, answer, max_val)``; ``generate`` turns a spec into the
+question dict. ``generate_batch`` draws many specs at once into columns
+(vectorized with NumPy when available) and formats text only on access.
 """
+import math
 import random
 
+from logic._np import np
+from logic.curriculum import CURRICULUM_FILE, Curriculum
+from logic.distractors import make_distractors, make_distractors_np, spread_for
+from logic.recent import RecentWindow
+from logic.review import pack_fact, unpack_fact
+
+# Question kinds (the `kind` column of a QuestionBatch)
+(ADD, SUB, MUL, DIV, POW, SQRT, ALGEBRA, PERCENT, GEOMETRY, SEQUENCE,
+ FRACTION) = range(11)
+
+_FORMATS = {
+    ADD:      '{a} + {b} = ?',
+    SUB:      '{a} - {b} = ?',
+    MUL:      '{a} x {b} = ?',
+    DIV:      '{a} / {b} = ?',
+    POW:      '{a}^{b} = ?',
+    SQRT:     'sqrt({a}) = ?',
+}
+
+# Skill names by kind (ratings in logic.skill_model are indexed by kind)
+SKILLS = ('addition', 'subtraction', 'multiplication', 'division', 'powers',
+          'sqrt', 'algebra', 'percent', 'geometry', 'sequence', 'fractions')
+
+# Percent choices of the curriculum template (the bank enumerates them)
+PERCENTS = (10, 20, 25, 50)
+# Bank draws are only used while the wanted range factor is this close to 1
+BANK_TOLERANCE = 0.25
+# Chance that a question is a due review fact (when one is due)
+REVIEW_SHARE = 0.3
+# Questions remembered to avoid repeats, and redraws allowed per question
+RECENT_WINDOW = 12
+MAX_REDRAWS = 4
+
+# Kinds each age group draws from (uniformly, or weighted by a SkillModel);
+# the other groups (14+) come from the curriculum
+AGE_KINDS = {
+    '5-7':   (ADD,),
+    '8-10':  (ADD, SUB, MUL),
+    '11-13': (ADD, SUB, MUL, DIV, POW, SQRT),
+}
+
+_curriculum = None
+
+
+def default_curriculum() -> Curriculum:
+    """Shared curriculum, compiled (or loaded from its cache) on first use."""
+    global _curriculum
+    if _curriculum is None:
+        _curriculum = Curriculum.load(CURRICULUM_FILE, SKILLS)
+    return _curriculum
+
+
+def format_question(kind: int, a: int, b: int, c: int = 0) -> str:
+    if kind in _FORMATS:
+        return _FORMATS[kind].format(a=a, b=b, c=c)
+    return default_curriculum().format(kind, a, b, c)
+
+
+def solve(kind: int, a: int, b: int, c: int = 0) -> int:
+    if kind not in _FORMATS:
+        return default_curriculum().spec(kind, a, b, c)[4]
+    if kind == ADD:
+        return a + b
+    if kind == SUB:
+        return a - b
+    if kind == MUL:
+        return a * b
+    if kind == DIV:
+        return a // b
+    if kind == POW:
+        return a ** b
+    return math.isqrt(a)                            # SQRT
+
+
+def typed_mistakes(kind: int, a: int, b: int, answer: int) -> list:
+    """Classic slips for a question, most plausible first."""
+    out = []
+    if kind in (ADD, SUB) and answer >= 10:
+        out += [answer + 10, answer - 10]           # carry / borrow slip
+    if answer >= 10 and answer % 10:
+        swapped = int(str(answer)[::-1])
+        if swapped != answer:
+            out.append(swapped)                     # swapped digits
+    if kind == ADD:
+        out.append(abs(a - b))                      # subtracted instead
+    elif kind == SUB:
+        out.append(a + b)                           # added instead
+    elif kind == MUL:
+        out += [a + b, answer + a]                  # added / one row too many
+    elif kind == DIV:
+        out.append(a - b)                           # subtracted instead
+    elif kind == POW:
+        out.append(a * b)                           # a^b read as a x b
+    elif kind == SQRT:
+        out.append(a // 2)                          # halved instead
+    elif kind == SEQUENCE:
+        out.append(answer - b)                      # repeated the last term
+    out += [answer + 1, answer - 1]                 # off by one
+    return out
+
 
 class QuestionGenerator:
-    def __init__(self, age_group: str):
+
+    def __init__(self, age_group: str, bank=None, skills=None, review=None,
+                 recent: int = RECENT_WINDOW):
+        """``bank``: optional ``QuestionBank`` serving precomputed questions;
+        kinds it doesn't hold are still generated live.
+        ``skills``: optional ``SkillModel`` steering kind choice and operand
+        ranges towards the child's level.
+        ``review``: optional ``ReviewScheduler``; due missed facts are mixed
+        in with fresh questions.
+        ``recent``: how many past questions a fresh one must differ from."""
         self.age_group = age_group
+        self.bank = bank
+        self.skills = skills
+        self.review = review
+        self.recent = RecentWindow(recent)
+        self._np_rng = None
+        # Age groups without hard-coded generators use curriculum templates
+        self.curriculum = default_curriculum()
+        self._group = None
+        if age_group not in AGE_KINDS:
+            self._group = (age_group if self.curriculum.kinds(age_group)
+                           else '14+')
+        self.kinds = AGE_KINDS.get(age_group) or self.curriculum.kinds(
+            self._group)
 
     def generate(self, level: int = 1) -> dict:
+        q = None
+        if self.review is not None and random.random() < REVIEW_SHARE:
+            fact = self.review.next_due(self.kinds)
+            if fact is not None:
+                q = self._from_fact(fact)      # deliberate repeat
+        if q is None:
+            # Redraw recent repeats a bounded number of times; a nearly
+            # exhausted space just gets the last draw
+            for _ in range(MAX_REDRAWS + 1):
+                q = self._draw(level)
+                if self._key(q) not in self.recent:
+                    break
+        self.recent.add(self._key(q))
+        return q
+
+    @staticmethod
+    def _key(q):
+        fact = q.get('fact')
+        return q['question'] if fact is None else fact
+
+    def _draw(self, level):
+        if self.bank is None:
+            return self._from_spec(self._spec(level))
+        kind = self._choose(self.kinds)
+        if abs(self._difficulty(kind)) <= BANK_TOLERANCE:
+            q = self.bank.draw(self.age_group, level, kind)
+            if q is not None:
+                q['skill'] = SKILLS[kind]
+                q['difficulty'] = 0.0
+                return q
+        # Generate the chosen kind live rather than choosing again
+        return self._from_spec(self._spec(level, kind))
+
+    def _from_spec(self, spec) -> dict:
+        kind, a, b, c, answer, max_val = spec
+        mistakes = typed_mistakes(kind, a, b, answer)
+        if self.age_group == '5-7':
+            q = self._build(format_question(kind, a, b, c), answer,
+                            max_val=max_val, qtype='addition', floor=1,
+                            mistakes=mistakes)
+        else:
+            q = self._build(format_question(kind, a, b, c), answer,
+                            max_val=max_val, mistakes=mistakes)
+        q['skill'] = SKILLS[kind]
+        q['difficulty'] = self._difficulty(kind)
+        q['fact'] = pack_fact(kind, a, b, c)
+        return q
+
+    def _from_fact(self, fact) -> dict:
+        kind, a, b, c = unpack_fact(fact)
+        if kind in self.curriculum:
+            spec = self.curriculum.spec(kind, a, b, c)
+        else:
+            answer = solve(kind, a, b, c)
+            spec = (kind, a, b, c, answer, self._max_val(answer))
+        q = self._from_spec(spec)
+        q['difficulty'] = 0.0
+        return q
+
+    def _max_val(self, answer):
+        """Distractor range of a question, as the ``_gen_*`` methods set it."""
+        if self.age_group == '5-7':
+            return 15
+        if self.age_group == '8-10':
+            return max(answer * 2, 20)
+        return max(answer * 3, 30)
+
+    def _spec(self, level, kind=None):
+        """One spec; ``kind`` None lets the skill model choose it."""
+        if kind is None:
+            kind = self._choose(self.kinds)
         if self.age_group == '5-7':
             return self._gen_5_7(level)
         elif self.age_group == '8-10':
-            return self._gen_8_10(level)
+            return self._gen_8_10(level, kind)
         elif self.age_group == '11-13':
-            return self._gen_11_13(level)
+            return self._gen_11_13(level, kind)
         else:
-            return self._gen_14plus(level)
+            return self._template(kind, level)
+
+    # ── Skill steering ────────────────────────────────────────────────────
+    def _choose(self, kinds):
+        if self._group is not None and kinds is self.kinds:
+            # Curriculum weights, adjusted by the skill model if any
+            if self.skills is None:
+                return self.curriculum.choose(self._group)
+            return self.skills.choose(
+                kinds, [self.curriculum.weights[k] for k in kinds])
+        if self.skills is None:
+            return random.choice(kinds)
+        return self.skills.choose(kinds)
+
+    def _difficulty(self, kind):
+        return 0.0 if self.skills is None else self.skills.difficulty(kind)
+
+    def _hi(self, kind, hi, lo=3, cap=None):
+        """Upper bound ``hi`` scaled by the skill's range factor."""
+        if self.skills is not None:
+            hi = max(lo, round(hi * self.skills.scale(kind)))
+        return hi if cap is None else min(hi, cap)
 
     # ── Age 5-7: ONLY single-digit addition ──────────────────────────────
     def _gen_5_7(self, level):
-        # Always single digit numbers (1-9), only addition
-        a = random.randint(1, 9)
-        b = random.randint(1, 9)
-        answer = a + b
-        question = f"{a} + {b} = ?"
-        # Wrong answers close to correct, but stay positive and reasonable
-        wrongs = set()
-        while len(wrongs) < 3:
-            delta = random.randint(1, 3)
-            candidate = answer + random.choice([-delta, delta])
-            if candidate != answer and candidate > 0:
-                wrongs.add(candidate)
-        choices = [answer] + list(wrongs)
-        random.shuffle(choices)
-        return {
-            'question': question,
-            'answer': answer,
-            'choices': [str(c) for c in choices],
-            'type': 'addition'
-        }
+        # Always single digit numbers (1-9), only addition; wrong answers
+        # within 3 of the correct one (max_val 15 -> spread 3)
+        hi = self._hi(ADD, 9, cap=9)
+        a = random.randint(1, hi)
+        b = random.randint(1, hi)
+        return ADD, a, b, 0, a + b, 15
 
     # ── Age 8-10 ──────────────────────────────────────────────────────────
-    def _gen_8_10(self, level):
-        max_num = min(10 + level * 3, 100)
-        op = random.choice(['+', '-', '*'])
-        if op == '*':
-            a = random.randint(2, min(10, max_num))
-            b = random.randint(2, min(10, max_num))
+    def _gen_8_10(self, level, kind):
+        max_num = self._hi(kind, min(10 + level * 3, 100), lo=5, cap=100)
+        if kind == MUL:
+            a = random.randint(2, min(self._hi(MUL, 10), max_num))
+            b = random.randint(2, min(self._hi(MUL, 10), max_num))
         else:
             a = random.randint(1, max_num)
             b = random.randint(1, max_num)
-        if op == '-':
+        if kind == SUB:
             a, b = max(a, b), min(a, b)
-        answer = a + b if op == '+' else (a - b if op == '-' else a * b)
-        sym = 'x' if op == '*' else op
-        question = f"{a} {sym} {b} = ?"
-        return self._build(question, answer, max_val=max(answer * 2, 20))
+        answer = a + b if kind == ADD else (a - b if kind == SUB else a * b)
+        return kind, a, b, 0, answer, max(answer * 2, 20)
 
     # ── Age 11-13 ─────────────────────────────────────────────────────────
-    def _gen_11_13(self, level):
-        max_num = min(20 + level * 5, 500)
-        op = random.choice(['+', '-', '*', '/', 'pow', 'sqrt'])
-        if op in ('+', '-'):
+    def _gen_11_13(self, level, kind):
+        if kind in (ADD, SUB):
+            max_num = self._hi(kind, min(20 + level * 5, 500), lo=20, cap=500)
             a = random.randint(10, max_num)
             b = random.randint(10, max_num)
-            if op == '-':
+            if kind == SUB:
                 a, b = max(a, b), min(a, b)
-            answer = a + b if op == '+' else a - b
-            question = f"{a} {op} {b} = ?"
-        elif op == '*':
-            a = random.randint(2, 20)
-            b = random.randint(2, 20)
+            answer = a + b if kind == ADD else a - b
+        elif kind == MUL:
+            a = random.randint(2, self._hi(MUL, 20))
+            b = random.randint(2, self._hi(MUL, 20))
             answer = a * b
-            question = f"{a} x {b} = ?"
-        elif op == '/':
-            b = random.randint(2, 12)
-            answer = random.randint(2, 20)
+        elif kind == DIV:
+            b = random.randint(2, self._hi(DIV, 12))
+            answer = random.randint(2, self._hi(DIV, 20))
             a = b * answer
-            question = f"{a} / {b} = ?"
-        elif op == 'pow':
-            a = random.randint(2, 10)
+        elif kind == POW:
+            a = random.randint(2, self._hi(POW, 10))
             b = random.randint(2, 3)
             answer = a ** b
-            question = f"{a}^{b} = ?"
         else:
-            answer = random.randint(2, 15)
-            a = answer ** 2
-            question = f"sqrt({a}) = ?"
-        return self._build(question, answer, max_val=max(answer * 3, 30))
-
-    # ── Age 14+ ───────────────────────────────────────────────────────────
-    def _gen_14plus(self, level):
-        qtype = random.choice(['algebra', 'percent', 'geometry', 'sequence'])
-        if qtype == 'algebra':
-            return self._algebra(level)
-        elif qtype == 'percent':
-            return self._percent(level)
-        elif qtype == 'geometry':
-            return self._geometry(level)
+            answer = random.randint(2, self._hi(SQRT, 15))
+            a, b = answer ** 2, 0
+        return kind, a, b, 0, answer, max(answer * 3, 30)
+
+    # ── Curriculum templates (14+) ────────────────────────────────────────
+    def _template(self, kind, level):
+        scale = 1.0 if self.skills is None else self.skills.scale(kind)
+        return self.curriculum.generate(kind, level, scale)
+
+    # ── Batches ───────────────────────────────────────────────────────────
+    def generate_batch(self, level: int = 1, n: int = 1) -> 'QuestionBatch':
+        """``n`` questions as columns; NumPy-vectorized when available
+        (curriculum age groups are drawn per row)."""
+        qtype = 'addition' if self.age_group == '5-7' else 'mcq'
+        floor = 1 if self.age_group == '5-7' else 0
+        if np is not None and self._group is None:
+            rng = self._np_rng
+            if rng is None:
+                rng = self._np_rng = np.random.default_rng()
+            if self.age_group == '5-7':
+                cols = self._batch_5_7(level, n, rng)
+            elif self.age_group == '8-10':
+                cols = self._batch_8_10(level, n, rng)
+            else:
+                cols = self._batch_11_13(level, n, rng)
+            kind, a, b, c, answer, max_val = cols
+            wrong = make_distractors_np(answer, max_val, floor, rng)
+            slot = rng.integers(0, 4, n)
         else:
-            return self._sequence(level)
-
-    def _algebra(self, level):
-        x = random.randint(1, 10 + level)
-        a = random.randint(1, 10)
-        b = random.randint(1, 20)
-        result = a * x + b
-        question = f"{a}x + {b} = {result},  x = ?"
-        return self._build(question, x, max_val=30)
-
-    def _percent(self, level):
-        pct = random.choice([10, 20, 25, 50])
-        base = random.randint(20, 200)
-        answer = int(base * pct / 100)
-        question = f"{pct}% of {base} = ?"
-        return self._build(question, answer, max_val=base)
-
-    def _geometry(self, level):
-        w = random.randint(3, 20)
-        h = random.randint(3, 20)
-        answer = w * h
-        question = f"Area: {w} x {h} = ?"
-        return self._build(question, answer, max_val=answer * 2 + 10)
-
-    def _sequence(self, level):
-        start = random.randint(1, 10)
-        step = random.randint(2, 5 + level)
-        seq = [start + i * step for i in range(4)]
-        answer = seq[-1] + step
-        shown = ', '.join(map(str, seq)) + ', ?'
-        question = f"{shown}"
-        return self._build(question, answer, max_val=answer * 2)
+            specs = [self._spec(level) for _ in range(n)]
+            kind, a, b, c, answer, max_val = (
+                [s[i] for s in specs] for i in range(6))
+            wrong = []
+            for ans, mv in zip(answer, max_val):
+                wrong.extend(make_distractors(ans, 3, spread_for(mv), floor))
+            slot = [random.randrange(4) for _ in range(n)]
+        return QuestionBatch(kind, a, b, c, answer, wrong, slot, qtype)
+
+    @staticmethod
+    def _batch_5_7(level, n, rng):
+        a = rng.integers(1, 10, n)
+        b = rng.integers(1, 10, n)
+        return np.full(n, ADD), a, b, np.zeros(n, int), a + b, np.full(n, 15)
+
+    @staticmethod
+    def _batch_8_10(level, n, rng):
+        max_num = min(10 + level * 3, 100)
+        small = min(10, max_num)
+        op = rng.integers(0, 3, n)
+        kind = np.array([ADD, SUB, MUL])[op]
+        mul = op == 2
+        a = np.where(mul, rng.integers(2, small + 1, n),
+                     rng.integers(1, max_num + 1, n))
+        b = np.where(mul, rng.integers(2, small + 1, n),
+                     rng.integers(1, max_num + 1, n))
+        sub = op == 1
+        a, b = (np.where(sub, np.maximum(a, b), a),
+                np.where(sub, np.minimum(a, b), b))
+        answer = np.select([op == 0, sub], [a + b, a - b], a * b)
+        return kind, a, b, np.zeros(n, int), answer, np.maximum(answer * 2, 20)
+
+    @staticmethod
+    def _batch_11_13(level, n, rng):
+        max_num = min(20 + level * 5, 500)
+        kinds = np.array([ADD, SUB, MUL, DIV, POW, SQRT])
+        kind = kinds[rng.integers(0, 6, n)]
+        # Draw every variant's operands, then pick per row
+        x = rng.integers(10, max_num + 1, n)
+        y = rng.integers(10, max_num + 1, n)
+        m1, m2 = rng.integers(2, 21, n), rng.integers(2, 21, n)
+        divisor, quotient = rng.integers(2, 13, n), rng.integers(2, 21, n)
+        base, exp = rng.integers(2, 11, n), rng.integers(2, 4, n)
+        root = rng.integers(2, 16, n)
+        conds = [kind == ADD, kind == SUB, kind == MUL, kind == DIV,
+                 kind == POW]
+        a = np.select(conds, [x, np.maximum(x, y), m1, divisor * quotient,
+                              base], root * root)
+        b = np.select(conds, [y, np.minimum(x, y), m2, divisor, exp], 0)
+        answer = np.select(conds, [x + y, np.abs(x - y), m1 * m2, quotient,
+                                   base ** exp], root)
+        return kind, a, b, np.zeros(n, int), answer, np.maximum(answer * 3, 30)
 
     # ── Helper ────────────────────────────────────────────────────────────
-    def _build(self, question: str, answer, max_val: int = 100) -> dict:
+    def _build(self, question: str, answer, max_val: int = 100,
+               qtype: str = 'mcq', floor: int = 0, mistakes=()) -> dict:
         if isinstance(answer, float) and answer == int(answer):
             answer = int(answer)
-        wrongs = set()
-        attempts = 0
-        while len(wrongs) < 3 and attempts < 50:
-            attempts += 1
-            delta = random.randint(1, max(3, max_val // 5))
-            candidate = int(answer) + random.choice([-delta, delta])
-            if candidate != int(answer) and candidate >= 0:
-                wrongs.add(candidate)
-        choices = [answer] + list(wrongs)[:3]
-        random.shuffle(choices)
+        choices = make_distractors(answer, 3, spread_for(max_val), floor,
+                                   mistakes)
+        choices.insert(random.randrange(4), answer)
         return {
             'question': question,
             'answer': answer,
             'choices': [str(c) for c in choices],
-            'type': 'mcq'
+            'type': qtype
+        }
+
+
+class QuestionBatch:
+    """Columnar questions: kind / operand / answer columns, three wrong
+    answers per row and the answer's slot among the four choices. Question
+    text and choice strings are only built when a row is read."""
+
+    def __init__(self, kind, a, b, c, answer, wrong, slot, qtype='mcq'):
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self.c = c
+        self.answer = answer
+        self.wrong = wrong      # (n, 3) array, or flat list of 3 * n
+        self.slot = slot
+        self.qtype = qtype
+
+    def __len__(self):
+        return len(self.answer)
+
+    def wrongs(self, i: int) -> list:
+        if np is not None and isinstance(self.wrong, np.ndarray):
+            return [int(v) for v in self.wrong[i]]
+        return list(self.wrong[3 * i:3 * i + 3])
+
+    def text(self, i: int) -> str:
+        return format_question(int(self.kind[i]), int(self.a[i]),
+                               int(self.b[i]), int(self.c[i]))
+
+    def __getitem__(self, i: int) -> dict:
+        """Row ``i`` in the same shape as ``QuestionGenerator.generate``."""
+        if i < 0:
+            i += len(self)
+        answer = int(self.answer[i])
+        choices = self.wrongs(i)
+        choices.insert(int(self.slot[i]), answer)
+        return {
+            'question': self.text(i),
+            'answer': answer,
+            'choices': [str(c) for c in choices],
+            'type': self.qtype,
+            'skill': SKILLS[int(self.kind[i])],
+            'difficulty': 0.0,
+            'fact': pack_fact(int(self.kind[i]), int(self.a[i]),
+                              int(self.b[i]), int(self.c[i]))
         }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,39 @@
+"""
+Recent-question window: a fixed-size ring buffer plus a count map, so
+membership tests, inserts and evictions are all O(1) and memory stays at
+``size`` keys however long a session runs.
+"""
+
+
+class RecentWindow:
+
+    def __init__(self, size: int = 12):
+        self.size = max(int(size), 0)
+        self._ring = [None] * self.size
+        self._pos = 0
+        self._counts = {}
+
+    def __contains__(self, key):
+        return key in self._counts
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def add(self, key):
+        if not self.size:
+            return
+        old = self._ring[self._pos]
+        if old is not None:
+            n = self._counts[old] - 1
+            if n:
+                self._counts[old] = n
+            else:
+                del self._counts[old]
+        self._ring[self._pos] = key
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self._pos = (self._pos + 1) % self.size
+
+    def clear(self):
+        self._ring = [None] * self.size
+        self._pos = 0
+        self._counts.clear()
@@ -0,0 +1,119 @@
+"""
+Spaced repetition of missed math facts (Leitner boxes).
+
+A fact is one question packed into an int:
+
+    kind | a << 4 | b << 20 | c << 36
+
+A wrong answer puts the fact in box 0; every correct review moves it one
+box up, and after the last box it is retired. Box ``i`` waits
+``INTERVALS[i]`` seconds. Due facts sit in a heap keyed by due time (stale
+entries are skipped lazily), one heap per kind so facts of kinds the
+current age group doesn't ask never block the rest. Taking the next due
+fact is O(log n) however many facts a profile tracks.
+
+State is a ``{str(fact): [box, due]}`` dict shared with the save data, so
+each update is O(1) and written with the next save.
+"""
+import heapq
+import time
+
+# Seconds a fact waits in each box: 1 min, 10 min, 1 h, 1 day, 3 days, 1 week
+INTERVALS = (60, 600, 3600, 86400, 3 * 86400, 7 * 86400)
+# A served fact is pushed back this long so it isn't repeated before the
+# answer comes in
+SERVE_DELAY = 30
+_FIELD = 1 << 16
+
+
+def pack_fact(kind: int, a: int, b: int, c: int = 0):
+    """Packed fact, or None when an operand doesn't fit its field."""
+    if not (0 <= a < _FIELD and 0 <= b < _FIELD and 0 <= c < 1 << 27):
+        return None
+    return kind | a << 4 | b << 20 | c << 36
+
+
+def unpack_fact(fact: int):
+    """(kind, a, b, c)"""
+    return fact & 0xF, fact >> 4 & 0xFFFF, fact >> 20 & 0xFFFF, fact >> 36
+
+
+class ReviewScheduler:
+
+    def __init__(self, state=None):
+        self.state = state if state is not None else {}
+        self._heaps = {}        # kind -> [(due, fact)]
+        self._rebuild()
+
+    @classmethod
+    def from_save(cls, save) -> 'ReviewScheduler':
+        state = save.get('review')
+        if not isinstance(state, dict):
+            state = {}
+        save.data['review'] = state
+        return cls(state)
+
+    def __len__(self):
+        return len(self.state)
+
+    def _rebuild(self):
+        self._heaps = {}
+        for key, (_, due) in self.state.items():
+            fact = int(key)
+            self._heaps.setdefault(fact & 0xF, []).append((due, fact))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+        self._entries = len(self.state)
+
+    def _schedule(self, fact, box, due):
+        self.state[str(fact)] = [box, due]
+        heapq.heappush(self._heaps.setdefault(fact & 0xF, []), (due, fact))
+        self._entries += 1
+        # Stale entries are dropped lazily; compact if they pile up
+        if self._entries > 2 * len(self.state) + 64:
+            self._rebuild()
+
+    def _top(self, kind):
+        """Earliest live entry of one kind's heap; drops stale ones."""
+        heap = self._heaps.get(kind)
+        while heap:
+            due, fact = heap[0]
+            entry = self.state.get(str(fact))
+            if entry is not None and entry[1] == due:
+                return heap[0]
+            heapq.heappop(heap)
+            self._entries -= 1
+        return None
+
+    def next_due(self, kinds, now=None):
+        """The earliest fact of ``kinds`` due by ``now``, or None. The fact
+        is held back ``SERVE_DELAY`` seconds."""
+        now = int(time.time()) if now is None else now
+        best = None
+        for kind in kinds:
+            top = self._top(kind)
+            if top is not None and top[0] <= now and (best is None or top < best):
+                best = top
+        if best is None:
+            return None
+        fact = best[1]
+        self._schedule(fact, self.state[str(fact)][0], now + SERVE_DELAY)
+        return fact
+
+    def record(self, fact, correct: bool, now=None):
+        """Wrong answers (re)enter box 0; correct ones promote tracked facts."""
+        if fact is None:
+            return
+        now = int(time.time()) if now is None else now
+        entry = self.state.get(str(fact))
+        if not correct:
+            self._schedule(fact, 0, now + INTERVALS[0])
+        elif entry is not None:
+            box = entry[0] + 1
+            if box >= len(INTERVALS):
+                del self.state[str(fact)]
+            else:
+                self._schedule(fact, box, now + INTERVALS[box])
+
+    def record_question(self, question: dict, correct: bool, now=None):
+        self.record(question.get('fact'), correct, now)
@@ -0,0 +1,355 @@
+"""
+Storage backends for ``SaveSystem``.
+
+``SaveSystem`` keeps the whole save in memory (``data``) and tells its
+backend about changes:
+
+    load()                  -> (data dict or None, revision, needs_snapshot)
+                               values in their JSON form (``_dumps``)
+    put(rev, key, value)    one top-level key changed (called right away)
+    add(rev, key, member, value)
+                            ``member`` was added to the set (or log) at
+                            ``key``
+    snapshot(data, rev)     write everything (debounced, background thread)
+    close()
+
+``JsonBackend`` is the single-file JSON store (atomic snapshots plus a
+journal). ``SqliteBackend`` keeps settings, level progress, owned items and
+cards in SQLite tables in WAL mode, so each change is one indexed UPSERT.
+"""
+import json
+import os
+import threading
+from array import array
+
+from logic.bitset import LevelSet
+
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover - python built without sqlite
+    sqlite3 = None
+
+# Older JSON snapshots kept next to the save file
+BACKUPS = 2
+
+
+def _encode(value):
+    """JSON fallback: level sets as base64 bitmaps, other sets as lists,
+    arrays (per-level stats) as lists."""
+    if isinstance(value, LevelSet):
+        return value.to_base64()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f'not JSON serializable: {type(value).__name__}')
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(',', ':'), default=_encode)
+
+
+class SaveBackend:
+    def load(self):
+        return None, 0, False
+
+    def put(self, rev, key, value):
+        pass
+
+    def add(self, rev, key, member, value):
+        self.put(rev, key, value)
+
+    def snapshot(self, data, rev):
+        pass
+
+    def close(self):
+        pass
+
+
+# ── JSON file ─────────────────────────────────────────────────────────────
+class JsonBackend(SaveBackend):
+    """Crash safety: snapshots go to a temp file that is fsynced and renamed
+    over the save (the previous ``BACKUPS`` snapshots are kept as ``.1``,
+    ``.2``). Every ``put`` is appended right away to a small journal
+    (``<save>.journal``, one JSON line ``[rev, key, value]``), which ``load``
+    replays on top of the newest readable snapshot. A snapshot of revision
+    R drops the journal lines up to R."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self._write_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._trim_torn()
+
+    def _trim_torn(self):
+        """Cut a line torn by a crash so later appends start on a fresh
+        line."""
+        try:
+            with open(self.journal_path, 'r+b') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        except OSError:
+            pass
+
+    def load(self):
+        path = self.path
+        snapshot, base_rev = None, 0
+        # Newest readable snapshot; a torn write falls back to a backup
+        for candidate in [path] + [f'{path}.{i}' for i in range(1, BACKUPS + 1)]:
+            try:
+                with open(candidate, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                break
+            except (OSError, ValueError):
+                continue
+        data = None
+        if isinstance(snapshot, dict):
+            base_rev = snapshot.pop('_rev', 0)
+            data = snapshot
+        replayed, rev = self._replay(base_rev)
+        if replayed:
+            data = dict(data or {}, **replayed)
+        return data, rev, rev > base_rev
+
+    def _replay(self, base_rev):
+        """Journal values newer than ``base_rev`` and the last rev seen."""
+        values, rev = {}, base_rev
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        r, key, value = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue    # damaged line: keep the rest
+                    if r > base_rev:
+                        values[key] = value
+                        rev = max(rev, r)
+        except OSError:
+            pass
+        return values, rev
+
+    def put(self, rev, key, value):
+        line = _dumps([rev, key, value]) + '\n'
+        with self._journal_lock:
+            try:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    def snapshot(self, data, rev):
+        path = self.path
+        with self._write_lock:
+            try:
+                # The C encoder snapshots each dict's items up front, so
+                # main-thread changes during the dump can't break it; they
+                # bump the revision and are picked up by the next snapshot.
+                # A set growing mid-dump raises RuntimeError: retried later.
+                text = _dumps(dict(data, _rev=rev))
+                tmp = path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._rotate_backups(path)
+                os.replace(tmp, path)
+            except (OSError, RuntimeError):
+                return False
+            self._trim_journal(rev)
+            return True
+
+    @staticmethod
+    def _rotate_backups(path):
+        # If killed between these renames, load() falls back to ``.1`` and
+        # the (untrimmed) journal
+        for i in range(BACKUPS, 0, -1):
+            src = path if i == 1 else f'{path}.{i - 1}'
+            if os.path.exists(src):
+                os.replace(src, f'{path}.{i}')
+
+    def _trim_journal(self, rev):
+        """Drop journal lines covered by the snapshot of ``rev``."""
+        with self._journal_lock:
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    keep = [line for line in f if _journal_rev(line) > rev]
+                with open(self.journal_path, 'w', encoding='utf-8') as f:
+                    f.writelines(keep)
+            except OSError:
+                pass
+
+
+def _journal_rev(line) -> int:
+    """Revision of a journal line; 0 (dropped on trim) if damaged."""
+    if not line.endswith('\n'):
+        return 0
+    try:
+        return int(json.loads(line)[0])
+    except (ValueError, TypeError, IndexError, KeyError):
+        return 0
+
+
+# ── SQLite ────────────────────────────────────────────────────────────────
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS levels (
+    level     INTEGER PRIMARY KEY,
+    unlocked  INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS owned (
+    category TEXT NOT NULL,
+    item     TEXT NOT NULL,
+    PRIMARY KEY (category, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cards (
+    card TEXT PRIMARY KEY
+) WITHOUT ROWID;
+'''
+
+_UPSERT_SETTING = ('INSERT INTO settings (key, value) VALUES (?, ?) '
+                   'ON CONFLICT (key) DO UPDATE SET value = excluded.value')
+_LEVEL_FLAG = {'unlocked_levels': 'unlocked', 'completed_levels': 'completed'}
+_OWNED = ('owned_outfits', 'owned_accessories', 'owned_companions')
+# Keys stored in their own tables rather than as settings rows
+TABLE_KEYS = frozenset(_LEVEL_FLAG) | frozenset(_OWNED) | {'collected_cards'}
+
+
+class SqliteBackend(SaveBackend):
+    """``migrate_from``: JSON save imported once into an empty database."""
+
+    def __init__(self, path: str, migrate_from: str = None):
+        if sqlite3 is None:
+            raise RuntimeError('sqlite3 is not available')
+        self.path = path
+        self.migrate_from = migrate_from
+        self._lock = threading.Lock()
+        self._written = {}      # settings key -> last JSON text stored
+        self._seed = False      # next snapshot fills the tables too
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def load(self):
+        with self._lock:
+            db = self._db
+            data = {k: json.loads(v) for k, v in
+                    db.execute('SELECT key, value FROM settings')}
+            self._written = {k: _dumps(v)
+                             for k, v in data.items()}
+            empty = not data and not db.execute(
+                'SELECT 1 FROM levels LIMIT 1').fetchone()
+        if empty:
+            return self._migrate()
+        for key, flag in _LEVEL_FLAG.items():
+            levels = [lvl for (lvl,) in self._db.execute(
+                f'SELECT level FROM levels WHERE {flag} ORDER BY level')]
+            if levels:
+                data[key] = LevelSet(levels).to_base64()
+        for key in _OWNED:
+            items = [i for (i,) in self._db.execute(
+                'SELECT item FROM owned WHERE category = ?', (key,))]
+            if items:
+                data[key] = items
+        cards = [c for (c,) in self._db.execute('SELECT card FROM cards')]
+        if cards:
+            data['collected_cards'] = cards
+        return data, 0, False
+
+    def _migrate(self):
+        """New database: import the JSON save once (journal included); the
+        first snapshot then fills every table, defaults included."""
+        self._seed = True
+        data = None
+        if self.migrate_from:
+            data, _, _ = JsonBackend(self.migrate_from).load()
+        return data, 0, True
+
+    # ── Writes ───────────────────────────────────────────────────────────
+    def put(self, rev, key, value):
+        with self._lock:
+            if key in TABLE_KEYS:
+                with self._db:
+                    self._db.execute('BEGIN')
+                    self._replace_table(key, value or [])
+            else:
+                self._put_setting(key, value)
+
+    def add(self, rev, key, member, value):
+        db = self._db
+        with self._lock:
+            if key in _LEVEL_FLAG:
+                flag = _LEVEL_FLAG[key]
+                db.execute(f'INSERT INTO levels (level, {flag}) VALUES (?, 1) '
+                           f'ON CONFLICT (level) DO UPDATE SET {flag} = 1',
+                           (member,))
+            elif key in _OWNED:
+                db.execute('INSERT INTO owned (category, item) VALUES (?, ?) '
+                           'ON CONFLICT DO NOTHING', (key, member))
+            elif key == 'collected_cards':
+                db.execute('INSERT INTO cards (card) VALUES (?) '
+                           'ON CONFLICT DO NOTHING', (member,))
+            else:
+                self._put_setting(key, value)
+
+    def snapshot(self, data, rev):
+        """Upserts the settings rows whose value changed. The dump and the
+        write hold the lock ``put`` takes, so a ``put`` can't land between
+        them and be overwritten by an older value."""
+        with self._lock:
+            if self._seed:
+                with self._db:
+                    self._db.execute('BEGIN')
+                    for key in TABLE_KEYS:
+                        self._replace_table(key, list(data.get(key) or []))
+                self._seed = False
+            rows = []
+            try:
+                for key, value in list(data.items()):
+                    if key in TABLE_KEYS:
+                        continue
+                    text = _dumps(value)
+                    if self._written.get(key) != text:
+                        rows.append((key, text))
+            except RuntimeError:
+                return False    # a set changed mid-dump: retried later
+            if rows:
+                with self._db:
+                    self._db.execute('BEGIN')
+                    self._db.executemany(_UPSERT_SETTING, rows)
+                self._written.update(rows)
+            return True
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _put_setting(self, key, value):
+        text = _dumps(value)
+        self._db.execute(_UPSERT_SETTING, (key, text))
+        self._written[key] = text
+
+    def _replace_table(self, key, members):
+        db = self._db
+        if key in _LEVEL_FLAG:
+            flag = _LEVEL_FLAG[key]
+            db.execute(f'UPDATE levels SET {flag} = 0')
+            db.executemany(
+                f'INSERT INTO levels (level, {flag}) VALUES (?, 1) '
+                f'ON CONFLICT (level) DO UPDATE SET {flag} = 1',
+                [(m,) for m in members])
+        elif key in _OWNED:
+            db.execute('DELETE FROM owned WHERE category = ?', (key,))
+            db.executemany('INSERT OR IGNORE INTO owned VALUES (?, ?)',
+                           [(key, m) for m in members])
+        else:
+            db.execute('DELETE FROM cards')
+            db.executemany('INSERT OR IGNORE INTO cards VALUES (?)',
+                           [(m,) for m in members])
@@ -0,0 +1,66 @@
+"""
+Save schema versions and the migrations between them.
+
+A save's ``schema_version`` (1 when missing: saves from before versioning)
+says which on-disk layout it uses. ``migrate`` runs the registered steps
+from that version up to ``SCHEMA_VERSION`` in order, on the data as loaded
+from disk (JSON forms: level sets as base64 strings, other sets as lists).
+An up-to-date save skips all of it.
+
+To change the layout, bump ``SCHEMA_VERSION`` and register one step:
+
+    @migration(3)
+    def _something(data):       # turns a version 3 save into version 4
+        ...
+"""
+from logic.bitset import LevelSet
+from logic.level_stats import LEVEL_COUNT
+
+SCHEMA_VERSION = 3
+
+MIGRATIONS = {}     # from-version -> step
+
+
+def migration(from_version: int):
+    def register(step):
+        if from_version in MIGRATIONS:
+            raise ValueError(f'duplicate migration from v{from_version}')
+        MIGRATIONS[from_version] = step
+        return step
+    return register
+
+
+def migrate(data: dict) -> bool:
+    """Upgrade ``data`` in place; True if any step ran."""
+    version = data.get('schema_version', 1)
+    if version >= SCHEMA_VERSION:
+        return False
+    while version < SCHEMA_VERSION:
+        MIGRATIONS[version](data)
+        version += 1
+    data['schema_version'] = version
+    return True
+
+
+# ── Steps ─────────────────────────────────────────────────────────────────
+@migration(1)
+def _levels_to_bitsets(data):
+    """Level lists become base64 bitmaps."""
+    for key in ('unlocked_levels', 'completed_levels'):
+        if isinstance(data.get(key), list):
+            data[key] = LevelSet(data[key]).to_base64()
+
+
+@migration(2)
+def _level_stats_table(data):
+    """Per-level stats: completed levels start with one star, and the old
+    total (inflated by replays) is replaced by their sum."""
+    if 'level_stats' in data:
+        return
+    stars = [0] * (LEVEL_COUNT + 1)
+    completed = data.get('completed_levels')
+    for level in LevelSet.from_base64(completed) if completed else ():
+        if level <= LEVEL_COUNT:
+            stars[level] = 1
+    data['level_stats'] = {'stars': stars}
+    data['total_stars'] = sum(stars)
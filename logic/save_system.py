@@ -1,117 +1,231 @@
 """
-Local save system using JSON file.
+Local save system.
+
+The save lives in memory (``data``); a storage backend
+(``logic.save_backends``) persists it: ``JsonBackend`` (default, one JSON
+file with atomic snapshots and a journal) or ``SqliteBackend`` (tables in
+WAL mode, one UPSERT per change).
+
+Write-behind by default: each mutation hands just the changed key (or the
+added list member) to the backend, bumps a revision counter and arms a
+short debounce timer; the full snapshot is written once per burst of
+changes on the timer's background thread. ``flush()`` snapshots
+synchronously (app pause and stop).
+
+No Kivy here: the app passes the save location in, so headless tools and
+simulations can use the save model directly.
 """
-import json
-import os
-from kivy.app import App
+import copy
+import threading
+
+from logic.bitset import LevelSet
+from logic.level_stats import LevelStats
+from logic.save_backends import JsonBackend
+from logic.save_migrations import SCHEMA_VERSION, migrate
 
 SAVE_FILE = 'mathforest_save.json'
+SAVE_DB = 'mathforest.db'
+# Seconds of quiet before a write-behind flush
+DEBOUNCE = 1.0
 
 DEFAULT_SAVE = {
+    'schema_version': SCHEMA_VERSION,
     'language': 'en',
     'age_group': '8-10',
     'gender': 'princess',
     'diamonds': 0,
     'current_level': 1,
-    'unlocked_levels': [1],
-    'completed_levels': [],
-    'owned_outfits': ['outfit_default'],
-    'owned_accessories': ['acc_none'],
-    'owned_companions': ['comp_none'],
+    'unlocked_levels': LevelSet([1]),
+    'completed_levels': LevelSet(),
+    'owned_outfits': {'outfit_default'},
+    'owned_accessories': {'acc_none'},
+    'owned_companions': {'comp_none'},
     'equipped_outfit': 'outfit_default',
     'equipped_accessory': 'acc_none',
     'equipped_companion': 'comp_none',
-    'collected_cards': [],
+    'collected_cards': set(),
     'total_stars': 0,
 }
 
+# Keys stored in a JSON form: level bitsets (base64) and sets (lists)
+DECODE = {
+    'unlocked_levels': LevelSet.from_base64,
+    'completed_levels': LevelSet.from_base64,
+    'owned_outfits': set,
+    'owned_accessories': set,
+    'owned_companions': set,
+    'collected_cards': set,
+}
 
-class SaveSystem:
-    def __init__(self):
-        self.data = dict(DEFAULT_SAVE)
 
-    def _path(self):
-        try:
-            from kivy.app import App
-            app = App.get_running_app()
-            return os.path.join(app.user_data_dir, SAVE_FILE)
-        except Exception:
-            return SAVE_FILE
+class SaveSystem:
+    def __init__(self, path: str = SAVE_FILE, backend=None,
+                 write_behind: bool = True, debounce: float = DEBOUNCE):
+        """``backend``: a ``SaveBackend``; defaults to ``JsonBackend`` on
+        ``path``."""
+        # Deep copy: mutators add to the default sets in place
+        self.data = copy.deepcopy(DEFAULT_SAVE)
+        self.path = path
+        self.backend = backend
+        self.write_behind = write_behind
+        self.debounce = debounce
+        self._rev = 0           # bumped by every change
+        self._saved_rev = 0     # revision last snapshotted
+        self._timer = None
+        self._write_lock = threading.Lock()
+        self.levels = None      # LevelStats, bound to the data by load()
+
+    def _backend(self):
+        # Resolved once (on the main thread) and reused by the writer
+        if self.backend is None:
+            self.backend = JsonBackend(self.path)
+        return self.backend
 
     def load(self):
-        path = self._path()
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                self.data.update(loaded)
-            except Exception:
-                self.data = dict(DEFAULT_SAVE)
-
-    def save(self):
-        path = self._path()
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2)
-        except Exception:
-            pass
+        """Older saves are migrated (``logic.save_migrations``) and
+        rewritten once; a current one is only decoded."""
+        loaded, rev, stale = self._backend().load()
+        upgraded = False
+        if loaded:
+            upgraded = migrate(loaded)
+            for key, decode in DECODE.items():
+                if key in loaded:
+                    loaded[key] = decode(loaded[key])
+            self.data.update(loaded)
+        self.levels = LevelStats.from_save(self)
+        self._rev = self._saved_rev = rev
+        if upgraded:
+            self.save(*self.data)
+            self.flush()
+        elif not loaded:
+            # New save: journal its layout version first, so data replayed
+            # from a journal alone (killed before the first snapshot) isn't
+            # taken for a v1 save and migrated again
+            self.save('schema_version')
+        elif stale:
+            # e.g. a replayed journal: fold it into a fresh snapshot
+            self._rev += 1
+            self._schedule_write()
+
+    def save(self, *keys):
+        """Mark the data changed; ``keys`` are top-level keys that changed
+        and go to the backend right away. The snapshot follows after
+        ``debounce`` seconds on a background thread in write-behind mode,
+        right away otherwise."""
+        self._rev += 1
+        backend = self._backend()
+        for key in keys:
+            backend.put(self._rev, key, self.data.get(key))
+        self._schedule_write()
+
+    def _added(self, key, member):
+        """``member`` was added to the set (or log) at ``key``."""
+        self._rev += 1
+        self._backend().add(self._rev, key, member, self.data[key])
+        self._schedule_write()
+
+    def flush(self):
+        """Write pending changes now, on the calling thread."""
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self._write()
+
+    def close(self):
+        self.flush()
+        self._backend().close()
+
+    @property
+    def dirty(self) -> bool:
+        return self._rev != self._saved_rev
+
+    def _schedule_write(self):
+        if not self.write_behind:
+            self._write()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.debounce, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        self._timer = None
+        self._write()
+        # Changed while writing: go round again
+        if self.dirty and self._timer is None:
+            self._schedule_write()
+
+    def _write(self):
+        with self._write_lock:
+            rev = self._rev
+            if rev != self._saved_rev and self._backend().snapshot(self.data, rev):
+                self._saved_rev = rev
 
     def get(self, key, default=None):
         return self.data.get(key, default)
 
     def set(self, key, value):
         self.data[key] = value
-        self.save()
+        self.save(key)
 
     def add_diamonds(self, amount: int):
         self.data['diamonds'] = self.data.get('diamonds', 0) + amount
-        self.save()
+        self.save('diamonds')
 
     def spend_diamonds(self, amount: int) -> bool:
         if self.data.get('diamonds', 0) >= amount:
             self.data['diamonds'] -= amount
-            self.save()
+            self.save('diamonds')
             return True
         return False
 
     def unlock_level(self, level: int):
-        unlocked = self.data.get('unlocked_levels', [])
+        unlocked = self.data['unlocked_levels']
         if level not in unlocked:
-            unlocked.append(level)
-            self.data['unlocked_levels'] = unlocked
-            self.save()
+            unlocked.add(level)
+            self._added('unlocked_levels', level)
 
-    def complete_level(self, level: int, stars: int = 3):
-        completed = self.data.get('completed_levels', [])
+    def complete_level(self, level: int, stars: int = 3,
+                       time_taken: float = None):
+        completed = self.data['completed_levels']
         if level not in completed:
-            completed.append(level)
-            self.data['completed_levels'] = completed
-        self.data['total_stars'] = self.data.get('total_stars', 0) + stars
+            completed.add(level)
+            self._added('completed_levels', level)
+        self.record_play(level, stars, time_taken)
         self.unlock_level(level + 1)
-        self.save()
+
+    def record_play(self, level: int, stars: int = 0,
+                    time_taken: float = None):
+        """Per-level stats for one play (``stars`` 0: not completed).
+        ``total_stars`` only grows when a level's best improves."""
+        levels = self.levels
+        before = levels.total_stars
+        if levels.record(level, stars, time_taken):
+            self.save('level_stats', 'level_history')
+        else:
+            self._added('level_history', levels.history[-1])
+        if levels.total_stars != before:
+            self.data['total_stars'] = levels.total_stars
+            self.save('total_stars')
 
     def add_card(self, card_id: str):
-        cards = self.data.get('collected_cards', [])
+        cards = self.data['collected_cards']
         if card_id not in cards:
-            cards.append(card_id)
-            self.data['collected_cards'] = cards
-            self.save()
+            cards.add(card_id)
+            self._added('collected_cards', card_id)
 
     def own_item(self, item_id: str, category: str) -> bool:
-        key = f'owned_{category}'
-        return item_id in self.data.get(key, [])
+        return item_id in self.data.get(f'owned_{category}', ())
 
     def buy_item(self, item_id: str, category: str):
         key = f'owned_{category}'
-        owned = self.data.get(key, [])
+        owned = self.data.setdefault(key, set())
         if item_id not in owned:
-            owned.append(item_id)
-            self.data[key] = owned
-            self.save()
+            owned.add(item_id)
+            self._added(key, item_id)
 
     def equip_item(self, item_id: str, category: str):
         self.data[f'equipped_{category}'] = item_id
-        self.save()
+        self.save(f'equipped_{category}')
 
     def t(self, key: str) -> str:
         """Quick translation helper"""
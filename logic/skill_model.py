@@ -0,0 +1,87 @@
+"""
+Adaptive difficulty: one Elo-style rating per skill (question kind).
+
+Ratings live on a logit scale where 0 means "answers nominal questions of
+this skill correctly ``TARGET`` of the time". A question's difficulty ``d``
+is the log2 of the factor its operand ranges were scaled by, so
+
+    P(correct) = sigmoid(rating - d + logit(TARGET))
+
+Each answer moves the rating by ``K * (outcome - P)`` in O(1), with ``K``
+shrinking as the skill gathers answers. The generator asks for
+``difficulty(kind)`` (ranges aimed at ``TARGET`` success) and uses
+``choose`` to serve weaker skills more often.
+
+Ratings are stored in the save file as two short lists
+(``skill_ratings``, ``skill_counts``), indexed by question kind.
+"""
+import math
+import random
+
+from logic.question_gen import SKILLS
+
+TARGET = 0.75
+_TARGET_LOGIT = math.log(TARGET / (1 - TARGET))
+# Range factors span 2**MIN_D .. 2**MAX_D of the level's nominal ranges
+MIN_D, MAX_D = -1.0, 1.0
+K_MAX, K_MIN = 0.6, 0.12
+# Ratings are kept near the steerable range so a skill can recover quickly
+RATING_LIMIT = 3.0
+# Every skill keeps at least this share of the choice weight
+WEIGHT_FLOOR = 0.25
+_KIND_OF = {name: kind for kind, name in enumerate(SKILLS)}
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+class SkillModel:
+
+    def __init__(self, ratings=None, counts=None):
+        n = len(SKILLS)
+        self.ratings = [float(r) for r in (ratings or [])][:n]
+        self.ratings += [0.0] * (n - len(self.ratings))
+        self.counts = [int(c) for c in (counts or [])][:n]
+        self.counts += [0] * (n - len(self.counts))
+
+    @classmethod
+    def from_save(cls, save) -> 'SkillModel':
+        """Model whose lists are the save's own, so every update is picked
+        up by the next ``save.save()`` without extra writes."""
+        model = cls(save.get('skill_ratings'), save.get('skill_counts'))
+        save.data['skill_ratings'] = model.ratings
+        save.data['skill_counts'] = model.counts
+        return model
+
+    def difficulty(self, kind: int) -> float:
+        """Range exponent aimed at ``TARGET`` success for ``kind``."""
+        return min(max(self.ratings[kind], MIN_D), MAX_D)
+
+    def scale(self, kind: int) -> float:
+        return 2.0 ** self.difficulty(kind)
+
+    def expected(self, kind: int, difficulty: float = 0.0) -> float:
+        return _sigmoid(self.ratings[kind] - difficulty + _TARGET_LOGIT)
+
+    def choose(self, kinds, weights=None, rng=random) -> int:
+        """Pick a kind, favouring skills with a low rating; ``weights``
+        are optional base weights per kind."""
+        adjusted = [WEIGHT_FLOOR + _sigmoid(-self.ratings[k]) for k in kinds]
+        if weights is not None:
+            adjusted = [w * a for w, a in zip(weights, adjusted)]
+        return rng.choices(kinds, adjusted)[0]
+
+    def record(self, kind: int, difficulty: float, correct: bool):
+        n = self.counts[kind]
+        k = max(K_MIN, K_MAX / (1.0 + n / 10.0))
+        p = self.expected(kind, difficulty)
+        r = self.ratings[kind] + k * ((1.0 if correct else 0.0) - p)
+        self.ratings[kind] = round(min(max(r, -RATING_LIMIT), RATING_LIMIT), 4)
+        self.counts[kind] = n + 1
+
+    def record_question(self, question: dict, correct: bool):
+        """Update from a question dict carrying ``skill``/``difficulty``."""
+        kind = _KIND_OF.get(question.get('skill'))
+        if kind is not None:
+            self.record(kind, question.get('difficulty', 0.0), correct)
@@ -13,10 +13,14 @@ from screens.main_menu import MainMenuScreen
 from screens.settings_screen import SettingsScreen
 from screens.game_screen import GameScreen
 from screens.maze_screen import MazeScreen
+from screens.endless_screen import EndlessScreen
 from screens.card_screen import CardScreen
 from screens.shop_screen import ShopScreen
 from screens.level_select import LevelSelectScreen
-from logic.save_system import SaveSystem
+from logic.event_log import EventLog
+from logic.profiles import ProfileManager
+from logic.skill_model import SkillModel
+from logic.review import ReviewScheduler
 
 if platform in ('win', 'linux', 'macosx'):
     Window.size = (400, 720)
@@ -27,8 +31,11 @@ class MathForestApp(App):
     icon = 'assets/images/icon.png'
 
     def build(self):
-        self.save = SaveSystem()
-        self.save.load()
+        # Only the profile index and the current profile's save are read
+        self.profiles = ProfileManager(self.user_data_dir)
+        self.profiles.load()
+        self.events = None
+        self._bind_save(self.profiles.current_save())
 
         self.sm = ScreenManager(transition=FadeTransition(duration=0.4))
         self.sm.add_widget(MainMenuScreen(name='main_menu'))
@@ -36,12 +43,25 @@ class MathForestApp(App):
         self.sm.add_widget(LevelSelectScreen(name='level_select'))
         self.sm.add_widget(GameScreen(name='game'))
         self.sm.add_widget(MazeScreen(name='maze'))
+        self.sm.add_widget(EndlessScreen(name='endless'))
         self.sm.add_widget(CardScreen(name='cards'))
         self.sm.add_widget(ShopScreen(name='shop'))
 
         self._load_bg_music()
         return self.sm
 
+    def _bind_save(self, save):
+        self.save = save
+        self.skills = SkillModel.from_save(save)
+        self.review = ReviewScheduler.from_save(save)
+        if self.events is not None:
+            self.events.close()
+        self.events = EventLog(
+            self.profiles.directory(self.profiles.current_id))
+
+    def switch_profile(self, profile_id: str):
+        self._bind_save(self.profiles.select(profile_id))
+
     def _load_bg_music(self):
         try:
             sound = SoundLoader.load('assets/sounds/menu_music.ogg')
@@ -53,13 +73,15 @@ class MathForestApp(App):
             pass
 
     def on_pause(self):
+        self.profiles.flush()
         return True
 
     def on_resume(self):
         pass
 
     def on_stop(self):
-        self.save.save()
+        self.profiles.close()
+        self.events.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,242 @@
+"""
+Endless Forest Screen - an unbounded maze streamed in chunks
+(logic.endless.EndlessMaze). Only the chunks around the player live in
+memory and on the canvas; the camera scrolls upwards with the player.
+"""
+from kivy.uix.widget import Widget
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.graphics import (Color, Rectangle, InstructionGroup,
+                           PushMatrix, PopMatrix, Translate)
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.core.window import Window
+from kivy.app import App
+import math
+import random
+
+from logic.endless import EndlessMaze
+from logic.question_gen import QuestionGenerator
+from logic.question_bank import default_bank
+from data.lang import get_text
+from screens.prefetch import QuestionPrefetcher
+from screens.maze_screen import (MazeScreen, PlayerWidget, AnimalWidget,
+                                 CELL, THEMES, ANIMAL_COLORS, ANIMAL_LETTERS)
+
+CHUNK_ROWS = 8          # rooms per chunk (2 * CHUNK_ROWS grid rows)
+CAMERA_ROW = 0.40       # player kept at this fraction of the screen height
+
+
+class EndlessScreen(MazeScreen):
+
+    def on_enter(self):
+        if not self._resume:
+            self._best_row = 1
+        super().on_enter()
+
+    # ── Build ─────────────────────────────────────────────────────────────
+    def _build(self, *_):
+        app = App.get_running_app()
+        save = app.save
+        self._lang = save.get('language', 'en')
+        self._level = 1
+        self._gender = save.get('gender', 'princess')
+        self._theme = THEMES['forest']
+        self._qgen = QuestionGenerator(save.get('age_group', '8-10'),
+                                       bank=default_bank(), skills=app.skills,
+                                       review=app.review)
+        if getattr(self, '_prefetch', None) is not None:
+            self._prefetch.stop()
+        self._prefetch = QuestionPrefetcher(self._qgen, self._level)
+        self._prefetch.start()
+
+        root = self._root
+        W = root.width or Window.width
+        H = root.height or Window.height
+        self._H = H
+        with root.canvas.before:
+            Color(*self._theme['bg'])
+            self._bg_rect = Rectangle(pos=(0, 0), size=(W, H))
+        root.bind(size=self._on_resize, pos=self._on_resize)
+
+        rooms = max(2, (int(W // CELL) - 1) // 2)
+        self._maze = EndlessMaze(width_rooms=rooms, chunk_rows=CHUNK_ROWS,
+                                 seed=random.getrandbits(32),
+                                 view_rows=math.ceil(H / CELL))
+        self._cols = self._maze.width
+        self._ox = int((W - self._cols * CELL) / 2)
+        self._oy = 0
+
+        # World layer: chunk tile groups drawn under one camera translation
+        self._world = Widget()
+        with self._world.canvas:
+            PushMatrix()
+            self._cam = Translate(self._ox, 0)
+        self._world.canvas.after.add(PopMatrix())
+        root.add_widget(self._world)
+        self._chunk_groups = {}
+        self._colors = ANIMAL_COLORS * 4
+        random.shuffle(self._colors)
+
+        self._player = PlayerWidget(gender=self._gender, pos=(0, 0))
+        self._stream()
+        root.add_widget(self._player)
+
+        self._hud_lbl = Label(
+            text=self._hud_text(),
+            font_size=dp(15),
+            color=(1, 1, 1, 1),
+            size_hint=(None, None),
+            size=(int(W - dp(100)), int(dp(34))),
+            pos=(int(dp(100)), int(H - dp(36))),
+            halign='center', valign='middle',
+        )
+        self._hud_lbl.bind(size=lambda w, s: setattr(w, 'text_size', s))
+        root.add_widget(self._hud_lbl)
+
+        back_btn = Button(
+            text='< ' + get_text(self._lang, 'home'),
+            font_size=dp(13),
+            background_normal='',
+            background_color=(0.25, 0.25, 0.25, 0.92),
+            size_hint=(None, None), size=(int(dp(90)), int(dp(34))),
+            pos=(int(dp(4)), int(H - dp(38))),
+        )
+        back_btn.bind(on_release=lambda *_: setattr(self.manager, 'current', 'main_menu'))
+        root.add_widget(back_btn)
+
+        self._add_dpad(W, H)
+        self._apply_camera()
+
+    # ── Chunk streaming ───────────────────────────────────────────────────
+    def _stream(self):
+        added, evicted = self._maze.stream(self._char_gy)
+        for idx in evicted:
+            self._world.canvas.remove(self._chunk_groups.pop(idx))
+            lo, hi = self._maze.chunk_span(idx)
+            for pos in [p for p in self._animals if lo <= p[1] < hi]:
+                aw, lbl = self._animals.pop(pos)
+                self._root.remove_widget(aw)
+                self._root.remove_widget(lbl)
+        for idx in added:
+            group = self._chunk_group(idx)
+            self._chunk_groups[idx] = group
+            self._world.canvas.add(group)
+            _, animals = self._maze.chunk(idx)
+            for i, pos in enumerate(animals):
+                if self._maze.is_defeated(pos):
+                    continue
+                aw = AnimalWidget(
+                    gx=pos[0], gy=pos[1],
+                    color=self._colors[(idx + i) % len(self._colors)],
+                    letter=ANIMAL_LETTERS[(idx * 3 + i) % len(ANIMAL_LETTERS)],
+                    ox=0, oy=0,
+                )
+                lbl = aw.add_letter_label(self._root)
+                self._animals[pos] = (aw, lbl)
+                self._root.add_widget(aw)
+        if added and self._player.parent:
+            # Keep the player above newly streamed animals
+            self._root.remove_widget(self._player)
+            self._root.add_widget(self._player)
+        if added or evicted:
+            self._place_sprites()
+
+    def _chunk_group(self, idx):
+        """Tiles of one chunk in world coordinates (x from 0, y from 0)."""
+        cells, _ = self._maze.chunk(idx)
+        lo, hi = self._maze.chunk_span(idx)
+        w = self._maze.width
+        group = InstructionGroup()
+        for value, color in ((EndlessMaze.WALL, self._theme['wall']),
+                             (EndlessMaze.PATH, self._theme['floor'])):
+            group.add(Color(*color))
+            for row in range(hi - lo):
+                for col in range(w):
+                    if cells[row * w + col] == value:
+                        group.add(Rectangle(
+                            pos=(col * CELL + 1, (lo + row) * CELL + 1),
+                            size=(CELL - 2, CELL - 2)))
+        if idx == 0:
+            group.add(Color(*self._theme['wall']))
+            group.add(Rectangle(pos=(1, 1), size=(w * CELL - 2, CELL - 2)))
+        return group
+
+    def _on_resize(self, *_):
+        super()._on_resize()
+        self._H = self._root.height
+        self._maze.keep = self._maze.keep_for(math.ceil(self._H / CELL))
+        self._stream()
+        self._apply_camera()
+
+    # ── Camera ────────────────────────────────────────────────────────────
+    def _apply_camera(self):
+        self._oy = int(self._H * CAMERA_ROW) - self._char_gy * CELL
+        self._cam.y = self._oy
+        self._place_sprites()
+
+    def _place_sprites(self):
+        for (gx, gy), (aw, _) in self._animals.items():
+            aw.pos = (self._ox + gx * CELL, self._oy + gy * CELL)
+        self._player.pos = (self._ox + self._char_gx * CELL,
+                            self._oy + self._char_gy * CELL)
+
+    # ── Movement ──────────────────────────────────────────────────────────
+    def _make_move(self, dx, dy):
+        def _move(*_):
+            if self._answering:
+                return
+            nx = self._char_gx + dx
+            ny = self._char_gy + dy
+            if self._maze.cell(nx, ny) == EndlessMaze.WALL:
+                return
+            self._char_gx = nx
+            self._char_gy = ny
+            self._best_row = max(self._best_row, ny)
+            # Questions get harder one level per chunk climbed
+            self._level = 1 + self._best_row // self._maze.chunk_height
+            self._prefetch.set_level(self._level)
+            self._stream()
+            self._apply_camera()
+            self._hud_lbl.text = self._hud_text()
+            self._check_cell(nx, ny)
+        return _move
+
+    def _check_cell(self, gx, gy):
+        if (gx, gy) in self._animals and not self._maze.is_defeated((gx, gy)):
+            self._answering = True
+            self._pending_pos = (gx, gy)
+            Clock.schedule_once(lambda *_: self._show_question(), 0.20)
+
+    def _on_answer(self, correct: bool):
+        self._answering = False
+        self._total += 1
+        self._record_answer(correct)
+        pos, self._pending_pos = self._pending_pos, None
+        if correct:
+            self._correct += 1
+            if pos in self._animals:
+                aw, lbl = self._animals.pop(pos)
+                self._maze.defeat(pos)
+                if lbl.parent:
+                    lbl.parent.remove_widget(lbl)
+                aw.defeat_anim(self._root)
+        else:
+            self._lives -= 1
+            if self._lives <= 0:
+                Clock.schedule_once(lambda *_: self._game_over(), 0.1)
+                return
+        self._hud_lbl.text = self._hud_text()
+
+    # ── HUD ───────────────────────────────────────────────────────────────
+    def _hud_text(self):
+        hearts = 'v' * self._lives + '.' * (3 - self._lives)
+        return (f'{get_text(self._lang, "endless")}  ^{self._best_row // 2}  '
+                f'[{hearts}]  * {self._correct}/{max(self._total, 1)}')
+
+    def _game_over(self):
+        self._show_popup(
+            f'GAME OVER\n^ {self._best_row // 2}',
+            ok_label=get_text(self._lang, 'retry'),
+            on_ok=self.on_enter,
+        )
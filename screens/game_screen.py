@@ -81,9 +81,12 @@ class AnimalFace(Widget):
 
 # ── Rounded answer button ─────────────────────────────────────────────────
 class AnswerButton(Button):
-    def __init__(self, btn_color=(0.3, 0.3, 0.8, 1), **kwargs):
+    def __init__(self, btn_color=(0.3, 0.3, 0.8, 1), label_texture=None,
+                 **kwargs):
+        """``label_texture``: pre-rendered text drawn instead of ``text``."""
         self._btn_color = btn_color
         self._flash = None
+        self._label_texture = label_texture
         super().__init__(**kwargs)
         self.background_normal = ''
         self.background_color = (0, 0, 0, 0)
@@ -97,6 +100,14 @@ class AnswerButton(Button):
         with self.canvas.before:
             Color(*c)
             RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(14)])
+        tex = self._label_texture
+        if tex is not None:
+            self.canvas.after.clear()
+            with self.canvas.after:
+                Color(1, 1, 1, 1)
+                Rectangle(texture=tex, size=tex.size,
+                          pos=(int(self.center_x - tex.width / 2),
+                               int(self.center_y - tex.height / 2)))
 
     def flash(self, correct: bool):
         self._flash = (0.1, 0.88, 0.1, 1) if correct else (0.88, 0.1, 0.1, 1)
@@ -128,7 +139,9 @@ class GameScreen(Screen):
         self._root.clear_widgets()
         self._answered = False
         self._choice_btns = []
-        Clock.schedule_once(self._build, 0.05)
+        # Prefetched questions come with their textures: build next frame
+        q_data = getattr(App.get_running_app(), '_pending_question', {})
+        Clock.schedule_once(self._build, 0 if 'textures' in q_data else 0.05)
 
     def _build(self, *_):
         app = App.get_running_app()
@@ -172,20 +185,36 @@ class GameScreen(Screen):
             halign='center', valign='middle',
         ))
 
+        # Pre-rendered textures, if prepared for this screen width
+        textures = q_data.get('textures')
+        if textures and textures.get('width') != int(W):
+            textures = None
+
         # Question text
         q_text = q_data.get('question', '?')
-        q_lbl = Label(
-            text=f'[b]{q_text}[/b]',
-            markup=True,
-            font_size=dp(26),
-            color=(1.0, 1.0, 0.50, 1),
-            size_hint=(None, None),
-            size=(int(W * 0.88), int(dp(70))),
-            pos=(int(W * 0.06), int(H * 0.63)),
-            halign='center', valign='middle',
-        )
-        q_lbl.bind(size=lambda w, s: setattr(w, 'text_size', s))
-        root.add_widget(q_lbl)
+        if textures:
+            # Own widget, so clear_widgets() drops it with the rest
+            tex = textures['question']
+            q_img = Widget(size_hint=(None, None), size=tex.size,
+                           pos=(int(W / 2 - tex.width / 2),
+                                int(H * 0.63 + dp(35) - tex.height / 2)))
+            with q_img.canvas:
+                Color(1, 1, 1, 1)
+                Rectangle(texture=tex, size=tex.size, pos=q_img.pos)
+            root.add_widget(q_img)
+        else:
+            q_lbl = Label(
+                text=f'[b]{q_text}[/b]',
+                markup=True,
+                font_size=dp(26),
+                color=(1.0, 1.0, 0.50, 1),
+                size_hint=(None, None),
+                size=(int(W * 0.88), int(dp(70))),
+                pos=(int(W * 0.06), int(H * 0.63)),
+                halign='center', valign='middle',
+            )
+            q_lbl.bind(size=lambda w, s: setattr(w, 'text_size', s))
+            root.add_widget(q_lbl)
 
         # Divider line
         with root.canvas:
@@ -207,7 +236,8 @@ class GameScreen(Screen):
             by = start_y - i * (btn_h + gap)
             btn = AnswerButton(
                 btn_color=CHOICE_COLORS[i % 4],
-                text=str(choice),
+                label_texture=textures['choices'][i] if textures else None,
+                text='' if textures else str(choice),
                 font_size=dp(22),
                 size_hint=(None, None),
                 size=(btn_w, btn_h),
@@ -256,7 +286,7 @@ class GameScreen(Screen):
         cb = getattr(app, '_maze_callback', None)
         if cb:
             cb(correct)
-        self.manager.current = 'maze'
+        self.manager.current = getattr(app, '_maze_return', 'maze')
 
     def _on_resize(self, *_):
         root = self._root
@@ -61,8 +61,9 @@ class LevelSelectScreen(Screen):
         app = App.get_running_app()
         save = app.save
         lang = save.get('language', 'en')
-        unlocked = save.get('unlocked_levels', [1])
-        completed = save.get('completed_levels', [])
+        # LevelSet bitsets: O(1) membership per level button
+        unlocked = save.get('unlocked_levels')
+        completed = save.get('completed_levels')
         root = self._root
 
         with root.canvas.before:
@@ -237,11 +237,12 @@ class MainMenuScreen(Screen):
         # Buttons
         btn_data = [
             ('play',     (0.18, 0.65, 0.22, 1)),
+            ('endless',  (0.10, 0.52, 0.42, 1)),
             ('cards',    (0.15, 0.48, 0.72, 1)),
             ('shop',     (0.78, 0.42, 0.10, 1)),
             ('settings', (0.48, 0.22, 0.68, 1)),
         ]
-        callbacks = [self._on_play, self._on_cards,
+        callbacks = [self._on_play, self._on_endless, self._on_cards,
                      self._on_shop, self._on_settings]
         btn_w = int(W * 0.72)
         btn_h = int(dp(52))
@@ -294,6 +295,9 @@ class MainMenuScreen(Screen):
     def _on_play(self, *_):
         self.manager.current = 'level_select'
 
+    def _on_endless(self, *_):
+        self.manager.current = 'endless'
+
     def _on_cards(self, *_):
         self.manager.current = 'cards'
 
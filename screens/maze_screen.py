@@ -15,11 +15,16 @@ from kivy.metrics import dp
 from kivy.core.window import Window
 from kivy.app import App
 import random
+import time
 
+from logic import event_log
 from logic.maze_gen import MazeGenerator
-from logic.question_gen import QuestionGenerator
+from logic.maze_pack import load_level
+from logic.question_gen import SKILLS, QuestionGenerator
+from logic.question_bank import default_bank
 from logic.reward_system import RewardSystem
 from data.lang import get_text
+from screens.prefetch import QuestionPrefetcher
 from data.levels_config import get_theme_for_level, diamonds_for_level
 
 CELL = int(dp(36))
@@ -202,8 +207,14 @@ class MazeScreen(Screen):
         super().__init__(**kwargs)
         self._root = FloatLayout()
         self.add_widget(self._root)
+        self._resume = False
 
     def on_enter(self):
+        # Coming back from a question: keep the level (and its generator's
+        # recent-question window) going
+        if self._resume:
+            self._resume = False
+            return
         self._root.clear_widgets()
         self._animals = {}       # (gx,gy) -> AnimalWidget
         self._defeated = set()   # set of (gx,gy)
@@ -213,6 +224,7 @@ class MazeScreen(Screen):
         self._correct = 0
         self._total = 0
         self._pending_pos = None
+        self._question = {}
         self._answering = False
         Clock.schedule_once(self._build, 0.05)
 
@@ -240,15 +252,20 @@ class MazeScreen(Screen):
             self._bg_rect = Rectangle(pos=(0, 0), size=(W, H))
         root.bind(size=self._on_resize, pos=self._on_resize)
 
-        # Generate maze
-        gen = MazeGenerator(level=self._level)
-        self._grid = gen.generate()
+        # Load maze (prebuilt pack, or generated from the level's seed)
+        gen = load_level(self._level)
+        self._grid = gen.grid
         self._cols = gen.width
         self._rows = gen.height
         self._animal_cells = list(gen.animal_positions)
         self._end_pos = gen.end_pos
 
-        self._qgen = QuestionGenerator(age_group)
+        self._qgen = QuestionGenerator(age_group, bank=default_bank(),
+                                       skills=app.skills, review=app.review)
+        if getattr(self, '_prefetch', None) is not None:
+            self._prefetch.stop()
+        self._prefetch = QuestionPrefetcher(self._qgen, self._level)
+        self._prefetch.start()
 
         # Centre maze
         maze_px_w = self._cols * CELL
@@ -315,6 +332,9 @@ class MazeScreen(Screen):
         # D-pad
         self._add_dpad(W, H)
 
+        # Level time: from the maze showing up, across question round trips
+        self._started = time.monotonic()
+
     # ── Maze tiles ────────────────────────────────────────────────────────
     def _draw_maze(self):
         root = self._root
@@ -373,6 +393,8 @@ class MazeScreen(Screen):
                 self._ox + nx * CELL,
                 self._oy + ny * CELL,
             )
+            App.get_running_app().events.record(
+                event_log.MOVE, self._level, value=ny << 16 | nx)
             self._check_cell(nx, ny)
         return _move
 
@@ -389,7 +411,10 @@ class MazeScreen(Screen):
     # ── Question ──────────────────────────────────────────────────────────
     def _show_question(self):
         app = App.get_running_app()
-        q = self._qgen.generate(level=self._level)
+        q = self._prefetch.pop()
+        self._question = q
+        self._asked = time.monotonic()
+        app.events.record(event_log.QUESTION, self._level, self._skill(q))
         app._pending_question = q
         # Pass the letter of the animal as "emoji"
         pos = self._pending_pos
@@ -399,12 +424,30 @@ class MazeScreen(Screen):
         else:
             app._pending_animal_emoji = '?'
         app._maze_callback = self._on_answer
+        app._maze_return = self.name
+        self._resume = True
         self.manager.current = 'game'
 
+    @staticmethod
+    def _skill(q):
+        skill = q.get('skill')
+        return SKILLS.index(skill) if skill in SKILLS else event_log.NO_SKILL
+
+    def _record_answer(self, correct: bool):
+        # In-memory updates; the save is written behind, once per burst
+        app = App.get_running_app()
+        latency = int((time.monotonic() - self._asked) * 1000)
+        app.events.record(event_log.ANSWER, self._level,
+                          self._skill(self._question), correct, latency)
+        app.skills.record_question(self._question, correct)
+        app.review.record_question(self._question, correct)
+        app.save.save()
+
     def _on_answer(self, correct: bool):
         # IMPORTANT: always reset _answering so player can move again
         self._answering = False
         self._total += 1
+        self._record_answer(correct)
 
         if correct:
             self._correct += 1
@@ -413,6 +456,8 @@ class MazeScreen(Screen):
             if pos and pos in self._animals:
                 aw, lbl = self._animals.pop(pos)
                 self._defeated.add(pos)
+                App.get_running_app().events.record(
+                    event_log.DEFEAT, self._level)
                 # Clear grid cell so player can walk through
                 gx, gy = pos
                 self._grid[gy][gx] = MazeGenerator.PATH
@@ -439,10 +484,13 @@ class MazeScreen(Screen):
     # ── Level complete ────────────────────────────────────────────────────
     def _level_complete(self):
         app = App.get_running_app()
+        elapsed = time.monotonic() - self._started
         diamonds = RewardSystem.calculate(
             self._level, self._correct, max(self._total, 1))
         stars = RewardSystem.stars(self._correct, max(self._total, 1))
-        app.save.complete_level(self._level, stars)
+        app.save.complete_level(self._level, stars, elapsed)
+        app.events.record(event_log.LEVEL_COMPLETE, self._level,
+                          flag=stars, value=int(elapsed))
         app.save.add_diamonds(diamonds)
         self._show_popup(
             f'LEVEL COMPLETE!\n<> +{diamonds}   * {stars}/3',
@@ -452,6 +500,9 @@ class MazeScreen(Screen):
 
     # ── Game over ─────────────────────────────────────────────────────────
     def _game_over(self):
+        app = App.get_running_app()
+        app.save.record_play(self._level)
+        app.events.record(event_log.GAME_OVER, self._level)
         self._show_popup(
             'GAME OVER\n' + get_text(self._lang, 'try_again'),
             ok_label=get_text(self._lang, 'retry'),
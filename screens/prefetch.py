@@ -0,0 +1,92 @@
+"""
+Question prefetcher.
+
+Keeps the next few questions ready, each with its question and choice
+labels already rendered to textures, so ``GameScreen`` can show a question
+in the frame right after the player steps on an animal. Questions are
+drawn and rendered in idle frames, one per frame, with
+``Clock.schedule_once``. Rendering needs the GL context, so this stays on
+the main thread.
+
+Prefetched questions are drawn a little ahead of time, so a skill rating
+update from the answer before only affects questions after them.
+"""
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.core.window import Window
+from kivy.metrics import dp
+
+# Must match the labels GameScreen would otherwise build
+QUESTION_COLOR = (1.0, 1.0, 0.50, 1)
+QUESTION_FONT = 26
+CHOICE_FONT = 22
+
+
+def render_label(text, font_size, color=(1, 1, 1, 1), size=None):
+    """Bold, centred text rendered once into a texture."""
+    lbl = CoreLabel(text=text, font_size=dp(font_size), color=color,
+                    bold=True, halign='center', valign='middle',
+                    text_size=size or (None, None))
+    lbl.refresh()
+    return lbl.texture
+
+
+def prepare(q: dict, width=None) -> dict:
+    """Adds ``q['textures']`` (question and choice textures for a screen
+    ``width`` pixels wide) and returns ``q``."""
+    width = int(width or Window.width)
+    q['textures'] = {
+        'width': width,
+        'question': render_label(q.get('question', '?'), QUESTION_FONT,
+                                 QUESTION_COLOR,
+                                 (int(width * 0.88), int(dp(70)))),
+        'choices': [render_label(str(c), CHOICE_FONT)
+                    for c in q.get('choices', ())],
+    }
+    return q
+
+
+class QuestionPrefetcher:
+
+    def __init__(self, qgen, level: int = 1, depth: int = 2):
+        self.qgen = qgen
+        self.level = level
+        self.depth = depth
+        self._ready = deque()
+        self._event = None
+
+    def __len__(self):
+        return len(self._ready)
+
+    def start(self):
+        if self._event is None and len(self._ready) < self.depth:
+            self._event = Clock.schedule_once(self._fill, 0)
+
+    def stop(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def set_level(self, level: int):
+        """Drop questions prepared for another level."""
+        if level != self.level:
+            self.level = level
+            self._ready.clear()
+            self.start()
+
+    def pop(self) -> dict:
+        """Next prepared question (built on the spot if none is ready)."""
+        q = self._ready.popleft() if self._ready else self._make()
+        self.start()
+        return q
+
+    def _make(self):
+        return prepare(self.qgen.generate(level=self.level))
+
+    def _fill(self, *_):
+        self._event = None
+        if len(self._ready) < self.depth:
+            self._ready.append(self._make())
+            self.start()
@@ -1,5 +1,5 @@
 """
-Settings Screen - choose age group, gender, language.
+Settings Screen - choose profile, age group, gender, language.
 """
 from kivy.uix.screenmanager import Screen
 from kivy.uix.floatlayout import FloatLayout
@@ -134,6 +134,21 @@ class SettingsScreen(Screen):
         root.add_widget(row1)
         root.add_widget(row2)
 
+        # --- Profile ---
+        profiles = app.profiles
+        prof_box = BoxLayout(size_hint=(0.9, None), height=dp(46),
+                             pos_hint={'center_x': 0.5, 'top': 0.36},
+                             spacing=dp(6))
+        for p in profiles.profiles:
+            btn = ToggleBtn(text=p['name'], font_size=dp(13),
+                            active=(p['id'] == profiles.current_id))
+            btn.bind(on_release=lambda b, pid=p['id']: self._set_profile(pid))
+            prof_box.add_widget(btn)
+        add_btn = ToggleBtn(text='+', font_size=dp(18), size_hint_x=0.4)
+        add_btn.bind(on_release=self._add_profile)
+        prof_box.add_widget(add_btn)
+        root.add_widget(prof_box)
+
         # Save / Back
         save_btn = Button(
             text=get_text(lang, 'save'),
@@ -170,6 +185,18 @@ class SettingsScreen(Screen):
             b.set_active(k == val)
         App.get_running_app().save.set('language', val)
 
+    def _set_profile(self, profile_id):
+        app = App.get_running_app()
+        if profile_id != app.profiles.current_id:
+            app.switch_profile(profile_id)
+            self.on_enter()
+
+    def _add_profile(self, *_):
+        app = App.get_running_app()
+        profile = app.profiles.create(f'Player {len(app.profiles.profiles) + 1}',
+                                      app.save.get('gender', 'princess'))
+        self._set_profile(profile['id'])
+
     def _on_save(self, *_):
         App.get_running_app().save.save()
         self.manager.current = 'main_menu'
@@ -14,6 +14,7 @@ from kivy.metrics import dp
 from kivy.app import App
 from kivy.animation import Animation
 from data.lang import get_text
+from logic import event_log
 import json, os
 
 
@@ -219,6 +220,7 @@ class ShopScreen(Screen):
             # Buy
             if save.spend_diamonds(price):
                 save.buy_item(item_id, category)
+                app.events.record(event_log.PURCHASE, value=price)
                 save.equip_item(item_id, cat_single)
                 self._diamond_lbl.text = (
                     f'[b]{get_text(self._lang, "shop")}[/b]   '
@@ -0,0 +1,45 @@
+"""
+Benchmark maze carving algorithms against grid area.
+
+    python -m tools.bench_maze [--sizes 51,101,201,401] [--repeat 3]
+
+Prints the best-of-N build time per algorithm and the cost per room, so the
+scaling (roughly linear for all four) is easy to compare.
+"""
+import argparse
+import time
+
+from logic.maze_gen import MazeGenerator
+
+
+def bench(algorithm, size, repeat, braid=0.0):
+    best = float('inf')
+    for i in range(repeat):
+        gen = MazeGenerator(size=(size, size), seed=i, algorithm=algorithm,
+                            braid=braid)
+        t0 = time.perf_counter()
+        gen.build()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='51,101,201,401',
+                        help='comma-separated odd side lengths')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--braid', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print(f'{"algorithm":<12}{"size":>7}{"rooms":>10}{"ms":>10}{"ns/room":>10}')
+    for algorithm in MazeGenerator.ALGORITHMS:
+        for size in sizes:
+            rooms = (size // 2) ** 2
+            t = bench(algorithm, size, args.repeat, args.braid)
+            print(f'{algorithm:<12}{size:>7}{rooms:>10}'
+                  f'{t * 1e3:>10.1f}{t * 1e9 / rooms:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Offline level-pack builder (no Kivy needed).
+
+    python -m tools.build_levels [--levels 1-300] [--jobs N] [--out PATH]
+
+Generates every level on a process pool, validates it (all open cells
+connected, exit reachable, expected animal count), scores it against the
+level's difficulty target and writes a versioned maze pack. Prints a
+per-level timing histogram; exits non-zero if any level fails validation.
+"""
+import argparse
+import os
+import sys
+import time
+
+from logic.maze_gen import MazeGenerator, difficulty_target, profile_distance
+from logic.maze_pack import PACK_FILE, build_records, write_pack
+
+
+def parse_levels(spec: str) -> range:
+    """'1-300' or '42' -> range of consecutive levels."""
+    lo, _, hi = spec.partition('-')
+    lo = int(lo)
+    hi = int(hi) if hi else lo
+    if lo < 1 or hi < lo:
+        raise argparse.ArgumentTypeError(f'bad level range: {spec!r}')
+    return range(lo, hi + 1)
+
+
+def validate(gen: MazeGenerator) -> list:
+    """Problems with a generated maze (empty list = valid)."""
+    errors = []
+    w, cells = gen.width, gen.cells
+    dist = gen.distance_field()
+    open_cells = [g for g, v in enumerate(cells) if v != MazeGenerator.WALL]
+    unreached = sum(1 for g in open_cells if dist[g] < 0)
+    if unreached:
+        errors.append(f'{unreached} open cells not connected to start')
+    if gen.solution_length() < 0:
+        errors.append('exit not reachable')
+    if gen.get_animal_count() != gen.expected_animals():
+        errors.append(f'{gen.get_animal_count()} animals, '
+                      f'expected {gen.expected_animals()}')
+    for x, y in gen.animal_positions:
+        if cells[y * w + x] != MazeGenerator.ANIMAL:
+            errors.append(f'animal at {(x, y)} not marked')
+            break
+    return errors
+
+
+def inspect(gen: MazeGenerator):
+    """Run in the worker: (score, errors) for a built level."""
+    score = profile_distance(gen.metrics(), difficulty_target(gen.level))
+    return score, validate(gen)
+
+
+def histogram(seconds: list, width: int = 40) -> str:
+    """Power-of-two millisecond buckets with a bar per bucket."""
+    buckets = {}
+    for s in seconds:
+        ms = s * 1000.0
+        edge = 1
+        while ms >= edge:
+            edge *= 2
+        buckets[edge] = buckets.get(edge, 0) + 1
+    peak = max(buckets.values(), default=1)
+    lines = []
+    for edge in sorted(buckets):
+        n = buckets[edge]
+        label = f'< {edge:g} ms'
+        lines.append(f'{label:>12} {n:>7} {"#" * max(1, n * width // peak)}')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Generate, validate and pack maze levels.')
+    parser.add_argument('--levels', type=parse_levels, default=range(1, 301),
+                        help='level range, e.g. 1-300 or 1-10000')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (1 = run in-process)')
+    parser.add_argument('--out', default=PACK_FILE)
+    parser.add_argument('--salt', default='')
+    parser.add_argument('--best-of', type=int, default=1,
+                        help='candidates per level (closest to target wins)')
+    parser.add_argument('--revision', type=int, default=int(time.time()),
+                        help='content revision stored in the pack header')
+    args = parser.parse_args(argv)
+
+    levels = args.levels
+    t0 = time.perf_counter()
+    results = build_records(levels, args.salt, args.best_of, args.jobs,
+                            inspect)
+    wall = time.perf_counter() - t0
+
+    failed = [(lv, errs) for lv, _, _, (_, errs) in results if errs]
+    for lv, errs in failed[:20]:
+        print(f'level {lv}: ' + '; '.join(errs), file=sys.stderr)
+    if failed:
+        print(f'{len(failed)} of {len(results)} levels failed validation',
+              file=sys.stderr)
+        return 1
+
+    write_pack(args.out, [rec for _, rec, _, _ in results],
+               first_level=levels[0], revision=args.revision, salt=args.salt)
+    seconds = [s for _, _, s, _ in results]
+    scores = [sc for _, _, _, (sc, _) in results]
+    print(f'{len(results)} levels in {wall:.2f}s with {args.jobs} job(s) '
+          f'({len(results) / wall:.0f} levels/s, '
+          f'cpu {sum(seconds):.2f}s)')
+    print(f'mean distance to difficulty target: {sum(scores) / len(scores):.3f}')
+    print(f'wrote {args.out} rev {args.revision} '
+          f'({os.path.getsize(args.out)} bytes)')
+    print('per-level build time:')
+    print(histogram(seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
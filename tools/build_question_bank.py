@@ -0,0 +1,31 @@
+"""
+Build the precomputed question bank (no Kivy needed).
+
+    python -m tools.build_question_bank [--out PATH]
+
+Enumerates or samples every banked (age group, level band, kind) table and
+writes ``data/question_bank.bin``; without it the game builds tables lazily.
+"""
+import argparse
+import os
+import time
+
+from logic.question_bank import BANK_FILE, QuestionBank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the question bank.')
+    parser.add_argument('--out', default=BANK_FILE)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    bank = QuestionBank().build_all()
+    bank.save(args.out)
+    entries = sum(len(t) for t in bank.tables.values())
+    print(f'{len(bank.tables)} tables, {entries} questions, '
+          f'{len(bank.strings)} strings in {time.perf_counter() - t0:.2f}s')
+    print(f'wrote {args.out} ({os.path.getsize(args.out)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
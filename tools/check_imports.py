@@ -0,0 +1,82 @@
+"""
+Check that the game core (``logic`` and ``data``) imports without Kivy.
+
+    python -m tools.check_imports [--budget-ms 50] [--repeat 3]
+
+Every module is imported in a fresh interpreter with ``kivy`` blocked, so
+an import of Kivy anywhere in its import chain fails the check. The
+best-of-N import time of ``logic.save_system`` must stay under the
+budget. Exits non-zero on any failure (usable as a CI step).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ('logic', 'data')
+TIMED = 'logic.save_system'
+
+# Run in the child: block kivy, import one module, print the time in ms
+_PROBE = '''
+import importlib, importlib.abc, sys, time
+
+class _NoKivy(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path=None, target=None):
+        if name == 'kivy' or name.startswith('kivy.'):
+            raise ImportError('kivy imported by the core: ' + name)
+
+sys.meta_path.insert(0, _NoKivy())
+t0 = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print((time.perf_counter() - t0) * 1e3)
+'''
+
+
+def core_modules():
+    for package in PACKAGES:
+        for name in sorted(os.listdir(os.path.join(ROOT, package))):
+            if name.endswith('.py'):
+                stem = name[:-3]
+                yield package if stem == '__init__' else f'{package}.{stem}'
+
+
+def import_ms(module):
+    """Import time in ms, or raises ``RuntimeError`` with the child's error."""
+    proc = subprocess.run([sys.executable, '-c', _PROBE, module], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return float(proc.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help=f'import budget for {TIMED}')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in core_modules():
+        try:
+            ms = import_ms(module)
+        except RuntimeError as exc:
+            print(f'FAIL {module}: {exc}')
+            failed = True
+            continue
+        print(f'ok   {module:<28}{ms:>8.1f} ms')
+
+    try:
+        best = min(import_ms(TIMED) for _ in range(args.repeat))
+    except RuntimeError:
+        return 1
+    verdict = 'ok  ' if best <= args.budget_ms else 'FAIL'
+    print(f'{verdict} {TIMED} best of {args.repeat}: {best:.1f} ms '
+          f'(budget {args.budget_ms:.0f} ms)')
+    failed = failed or best > args.budget_ms
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())